@@ -0,0 +1,27 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.auth.service import get_current_active_user
+from app.indexes import explain_hot_queries
+from app.users.models import User
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+# ---------- Helpers ----------
+def require_admin(current_user: Annotated[User, Depends(get_current_active_user)]) -> User:
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    return current_user
+
+
+# ---------- Routes ----------
+@router.get("/indexes/explain")
+async def explain_indexes(current_user: Annotated[User, Depends(require_admin)]):
+    """Explain each hot query and flag the ones that fall back to a collection scan."""
+    report = await explain_hot_queries()
+    return {
+        "collection_scans": [row["query"] for row in report if row["collection_scan"]],
+        "queries": report,
+    }
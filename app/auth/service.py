@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, timezone, datetime
 from typing import Annotated
 import jwt
@@ -8,29 +12,87 @@ from jwt import InvalidTokenError
 from pwdlib import PasswordHash
 
 from app.auth.models import TokenData
+from app.metrics import password_hash_duration
 from app.users.models import User
-from app.users.service import get_user
+from app.users.service import get_cached_user, get_user
 
 SECRET_KEY = config("SECRET_KEY")
 ALGORITHM = "HS256"
 
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=2, cast=int)
+
 password_hash = PasswordHash.recommended()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 
-def verify_password(plain_password, hashed_password):
-    return password_hash.verify(plain_password, hashed_password)
+class PasswordHashPool:
+    """Bounded thread pool for Argon2 work, so hashing never blocks the event loop."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use and again after shutdown, so a later lifespan
+        # in the same process (tests, benchmarks) gets a fresh pool
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="argon2")
+        return self._executor
+
+    def _call(self, fn, *args):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            password_hash_duration.observe(time.perf_counter() - started, operation=fn.__name__)
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    async def run(self, fn, *args):
+        with self._lock:
+            self.queued += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self._call, fn, *args)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hash_pool = PasswordHashPool(PASSWORD_HASH_WORKERS)
+
+
+async def verify_password(plain_password, hashed_password):
+    return await hash_pool.run(password_hash.verify, plain_password, hashed_password)
 
 
-def get_password_hash(password):
-    return password_hash.hash(password)
+async def get_password_hash(password):
+    return await hash_pool.run(password_hash.hash, password)
 
 
 async def authenticate_user(username: str, password: str):
     user = await get_user(username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         return False
     return user
 
@@ -62,7 +124,7 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
         token_data = TokenData(username=username)
     except InvalidTokenError:
         raise credentials_exception
-    user = await get_user(username=token_data.username)
+    user = await get_cached_user(username=token_data.username)
     if user is None:
         raise credentials_exception
     return user
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries live at most `ttl` seconds."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def _is_valid(self, value: Any) -> bool:
+        """Subclasses can reject entries that are fresh but otherwise outdated."""
+        return True
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl or not self._is_valid(entry[1]):
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "oldest_entry_age_seconds": max(
+                (now - created for created, _ in self._entries.values()), default=0.0
+            ),
+        }
+
+
+class PeriodicSnapshot:
+    """In-process copy of some collection data, reloaded once it is `ttl` seconds old.
+
+    Subclasses implement `_fetch`; `load` runs it and restarts the clock.
+    Writers call `invalidate` so the next `refresh_if_stale` reloads.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._loaded_at: float | None = None
+        # Bumped by invalidate, so a load that overlapped a write isn't taken as fresh
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def _is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    async def _fetch(self):
+        raise NotImplementedError
+
+    def invalidate(self):
+        self._generation += 1
+        self._loaded_at = None
+
+    async def load(self):
+        generation = self._generation
+        await self._fetch()
+        if generation == self._generation:
+            self._loaded_at = time.monotonic()
+
+    async def refresh_if_stale(self):
+        if self._is_stale():
+            # Concurrent requests wait for one reload instead of each running it
+            async with self._lock:
+                if self._is_stale():
+                    await self.load()
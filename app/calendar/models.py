@@ -0,0 +1,9 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+# One calendar move: an order and its new due date
+class DueDateUpdate(BaseModel):
+    order_id: str
+    new_due_at: datetime
@@ -1,11 +1,19 @@
+from typing import List
+
 from fastapi import APIRouter, HTTPException, Query
 from datetime import datetime
 from bson import ObjectId
-from app.database import orders_collection
-from app.orders.service import serialize_order
+from pymongo import ReturnDocument, UpdateOne
+from app.calendar.models import DueDateUpdate
+from app.database import orders_analytics_collection, orders_collection
+from app.fields import mongo_projection, parse_fields
+from app.orders.service import ORDER_FIELDS, serialize_order
+from app.serialization import FastJSONResponse
 
 router = APIRouter(prefix="/calendar", tags=["Calendar"])
 
+MAX_BATCH_SIZE = 500
+
 # ---------- Helpers ----------
 def validate_object_id(id: str) -> ObjectId:
     if not ObjectId.is_valid(id):
@@ -18,13 +26,42 @@ def validate_object_id(id: str) -> ObjectId:
 async def get_orders_in_range(
     start: datetime = Query(..., description="Start date (inclusive)"),
     end: datetime = Query(..., description="End date (inclusive)"),
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,due_at,status"),
 ):
     """Return all orders with due dates within a given range."""
     query = {"due_at": {"$gte": start, "$lte": end}}
+    field_list = parse_fields(fields, ORDER_FIELDS)
+    projection = mongo_projection(field_list) if field_list else None
+    orders = []
+    # Range scans tolerate bounded staleness; the write routes below read
+    # their own changes back from the primary
+    async for order in orders_analytics_collection.find(query, projection):
+        orders.append(serialize_order(order, field_list))
+    return FastJSONResponse(orders)
+
+
+@router.put("/batch")
+async def update_due_dates(updates: List[DueDateUpdate]):
+    """Move several orders at once (used by multi-select drag-and-drop)."""
+    if len(updates) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} moves per request")
+
+    # Later moves of the same order win
+    due_dates = {validate_object_id(update.order_id): update.new_due_at for update in updates}
+    if not due_dates:
+        return {"orders": [], "not_found": []}
+
+    await orders_collection.bulk_write(
+        [UpdateOne({"_id": oid}, {"$set": {"due_at": due_at}}) for oid, due_at in due_dates.items()],
+        ordered=False,
+    )
+
     orders = []
-    async for order in orders_collection.find(query):
+    async for order in orders_collection.find({"_id": {"$in": list(due_dates)}}):
         orders.append(serialize_order(order))
-    return orders
+    found = {order["id"] for order in orders}
+    not_found = [str(oid) for oid in due_dates if str(oid) not in found]
+    return FastJSONResponse({"orders": orders, "not_found": not_found})
 
 
 @router.put("/{order_id}")
@@ -32,12 +69,13 @@ async def update_order_due_date(order_id: str, new_due_at: datetime):
     """Update an order's due date (used by calendar drag-and-drop)."""
     oid = validate_object_id(order_id)
 
-    result = await orders_collection.update_one(
-        {"_id": oid}, {"$set": {"due_at": new_due_at}}
+    updated_order = await orders_collection.find_one_and_update(
+        {"_id": oid},
+        {"$set": {"due_at": new_due_at}},
+        return_document=ReturnDocument.AFTER,
     )
 
-    if result.matched_count == 0:
+    if not updated_order:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    updated_order = await orders_collection.find_one({"_id": oid})
     return serialize_order(updated_order)
@@ -1,14 +1,173 @@
-from decouple import config
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from decouple import Csv, config
 from pymongo import AsyncMongoClient
+from pymongo.monitoring import ConnectionPoolListener
+from pymongo.read_preferences import SecondaryPreferred
+
+from app.metrics import command_metrics
+from app.profiling import query_profiler
+
+MONGODB_URL = config("MONGODB_URL").strip('"')
+MONGODB_DB_NAME = config("MONGODB_DB_NAME", default="optiflow")
+
+# Connection pool tuning, passed straight through to AsyncMongoClient
+MONGO_MAX_POOL_SIZE = config("MONGO_MAX_POOL_SIZE", default=100, cast=int)
+MONGO_MIN_POOL_SIZE = config("MONGO_MIN_POOL_SIZE", default=5, cast=int)
+MONGO_MAX_IDLE_TIME_MS = config("MONGO_MAX_IDLE_TIME_MS", default=300000, cast=int)
+MONGO_WAIT_QUEUE_TIMEOUT_MS = config("MONGO_WAIT_QUEUE_TIMEOUT_MS", default=10000, cast=int)
+MONGO_COMPRESSORS = config("MONGO_COMPRESSORS", default="", cast=Csv())
+
+# How far behind the primary a secondary may be and still serve analytical
+# reads; MongoDB requires at least 90 seconds, -1 means no limit
+ANALYTICS_MAX_STALENESS_SECONDS = config("ANALYTICS_MAX_STALENESS_SECONDS", default=90, cast=int)
+
+
+class PoolStats(ConnectionPoolListener):
+    """Connection counts across every server pool, fed by pymongo's pool events."""
+
+    def __init__(self):
+        self.open = 0
+        self.checked_out = 0
+        self.check_out_failures = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "max_pool_size": MONGO_MAX_POOL_SIZE,
+            "min_pool_size": MONGO_MIN_POOL_SIZE,
+            "open": self.open,
+            "checked_out": self.checked_out,
+            "utilization": self.checked_out / MONGO_MAX_POOL_SIZE if MONGO_MAX_POOL_SIZE else 0.0,
+            "check_out_failures": self.check_out_failures,
+        }
+
+    def connection_created(self, event):
+        self.open += 1
+
+    def connection_closed(self, event):
+        self.open -= 1
+
+    def connection_checked_out(self, event):
+        self.checked_out += 1
+
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+
+    def connection_check_out_failed(self, event):
+        self.check_out_failures += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
 
-client = AsyncMongoClient(config("MONGODB_URL").strip('"'))
+    def pool_closed(self, event):
+        pass
+
+
+pool_stats = PoolStats()
+
+# Created by `connect_to_mongo` in the app lifespan (or a script's main)
+client: AsyncMongoClient | None = None
+mongo_db = None
+
+
+class CollectionHandle:
+    """Module-level stand-in for a collection of the lifespan-managed client.
+
+    Routers import these at load time, before any client exists; attribute
+    access resolves against whichever client is currently connected.
+    """
+
+    def __init__(self, name: str, **options):
+        self.name = name
+        self._options = options
+        self._bound_to = None
+        self._collection = None
+
+    def __getattr__(self, attr):
+        if mongo_db is None:
+            raise RuntimeError("MongoDB client is not connected")
+        if self._bound_to is not mongo_db:
+            self._collection = mongo_db.get_collection(self.name, **self._options)
+            self._bound_to = mongo_db
+        return getattr(self._collection, attr)
 
-# Access to Optiflow MongoDB
-mongo_db = client.optiflow
 
 # Access to all collections on Optiflow MongoDB
-users_collection = mongo_db.users
-orders_collection = mongo_db.orders
-vendors_collection = mongo_db.vendors
-products_collection = mongo_db.products
+users_collection = CollectionHandle("users")
+orders_collection = CollectionHandle("orders")
+vendors_collection = CollectionHandle("vendors")
+products_collection = CollectionHandle("products")
+order_rollups_collection = CollectionHandle("order_rollups")
+
+# Analytical reads (reports, calendar scans, counts) go to a secondary when one
+# is fresh enough so they don't compete with order writes on the primary.
+# Writes and read-your-writes paths keep using the handles above. Against a
+# standalone server these behave exactly like the primary handles.
+analytics_read_preference = SecondaryPreferred(max_staleness=ANALYTICS_MAX_STALENESS_SECONDS)
+orders_analytics_collection = CollectionHandle("orders", read_preference=analytics_read_preference)
+order_rollups_analytics_collection = CollectionHandle(
+    "order_rollups", read_preference=analytics_read_preference
+)
+users_analytics_collection = CollectionHandle("users", read_preference=analytics_read_preference)
+
+
+async def connect_to_mongo():
+    global client, mongo_db
+    options = {}
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    client = AsyncMongoClient(
+        MONGODB_URL,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        event_listeners=[pool_stats, command_metrics, query_profiler],
+        **options,
+    )
+    mongo_db = client[MONGODB_DB_NAME]
+
+
+async def warm_up_pool():
+    """Discover the servers and open `minPoolSize` connections before taking traffic."""
+    await client.aconnect()
+    await asyncio.gather(*(ping() for _ in range(max(MONGO_MIN_POOL_SIZE, 1))))
+
+
+async def close_mongo_connection():
+    global client, mongo_db
+    if client is not None:
+        await client.close()
+    client = None
+    mongo_db = None
+
+
+async def ping() -> float:
+    """Round-trip a `ping` command and return its latency in milliseconds."""
+    started = time.perf_counter()
+    await mongo_db.command("ping")
+    return (time.perf_counter() - started) * 1000
+
 
+@asynccontextmanager
+async def mongo_connection():
+    """Connect for the duration of the block; used by scripts run outside the app."""
+    await connect_to_mongo()
+    try:
+        yield
+    finally:
+        await close_mongo_connection()
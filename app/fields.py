@@ -0,0 +1,26 @@
+from fastapi import HTTPException
+
+
+def parse_fields(fields: str | None, allowed) -> list[str] | None:
+    """Parse a `?fields=a,b` sparse fieldset. `id` is always returned."""
+    if not fields:
+        return None
+    requested = ["id"]
+    for name in fields.split(","):
+        name = name.strip()
+        if not name or name in requested:
+            continue
+        if name not in allowed:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {name}")
+        requested.append(name)
+    return requested
+
+
+def mongo_projection(fields: list[str], always: tuple[str, ...] = ()) -> dict:
+    """Project only the document keys behind `fields` (plus `always`) and `_id`."""
+    # Always non-empty: pymongo drops an empty projection and the server
+    # would then return whole documents
+    projection = {"_id": 1}
+    projection.update({name: 1 for name in fields if name != "id"})
+    projection.update({name: 1 for name in always})
+    return projection
@@ -0,0 +1,149 @@
+import logging
+from datetime import UTC, datetime, timedelta
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import ConnectionFailure, PyMongoError
+
+from app.database import (
+    order_rollups_collection,
+    orders_collection,
+    products_collection,
+    users_collection,
+)
+from app.orders.service import DEFAULT_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Indexes the routers rely on, declared next to the collection they belong to
+INDEXES = [
+    (
+        users_collection,
+        [IndexModel([("username", ASCENDING)], unique=True)],
+    ),
+    (
+        orders_collection,
+        [
+            # Customer order listing: user_id filter, newest first
+            IndexModel([("user_id", ASCENDING), ("order_date", DESCENDING), ("_id", DESCENDING)]),
+            # Admin order listing and pagination cursor
+            IndexModel([("order_date", DESCENDING), ("_id", DESCENDING)]),
+            # Calendar range scans
+            IndexModel([("due_at", ASCENDING)]),
+            # Reporting summary: order_date range grouped by vendor and status
+            IndexModel([("order_date", ASCENDING), ("vendor_id", ASCENDING), ("status", ASCENDING)]),
+        ],
+    ),
+    (
+        order_rollups_collection,
+        # Summary reads by day range; also the `on` key of the rebuild $merge
+        [IndexModel([("day", ASCENDING), ("vendor_id", ASCENDING), ("status", ASCENDING)], unique=True)],
+    ),
+    (
+        products_collection,
+        [
+            IndexModel([("id", ASCENDING)], unique=True),
+            IndexModel([("category", ASCENDING)]),
+            # Catalog filters and sorts
+            IndexModel([("category", ASCENDING), ("price", ASCENDING)]),
+            IndexModel([("price", ASCENDING)]),
+            IndexModel([("rating.rate", DESCENDING)]),
+            IndexModel([("title", TEXT), ("description", TEXT)]),
+        ],
+    ),
+]
+
+# Collections whose indexes the last `ensure_indexes` confirmed; code relying
+# on a unique index for correctness checks here before trusting it
+ensured_collections: set[str] = set()
+
+
+async def ensure_indexes():
+    """Create any missing index. Failures are logged so the API can still start."""
+    for collection, indexes in INDEXES:
+        try:
+            await collection.create_indexes(indexes)
+            ensured_collections.add(collection.name)
+        except ConnectionFailure as exc:
+            logger.error("Skipping index bootstrap, database unreachable: %s", exc)
+            return
+        except PyMongoError as exc:
+            logger.error("Could not ensure indexes on %s: %s", collection.name, exc)
+
+
+# Representative shapes of the hottest queries, used to verify index coverage
+_now = datetime.now(UTC)
+_range = {"$gte": _now - timedelta(days=30), "$lte": _now}
+
+HOT_QUERIES = [
+    {
+        "name": "orders.list_own",
+        "collection": orders_collection,
+        "filter": {"user_id": {"$in": ["user-id", "username"]}},
+        "sort": [("order_date", DESCENDING), ("_id", DESCENDING)],
+    },
+    {
+        "name": "orders.list_all",
+        "collection": orders_collection,
+        "filter": {},
+        "sort": [("order_date", DESCENDING), ("_id", DESCENDING)],
+    },
+    {
+        "name": "calendar.due_range",
+        "collection": orders_collection,
+        "filter": {"due_at": _range},
+    },
+    {
+        "name": "reports.summary",
+        "collection": orders_collection,
+        "filter": {"order_date": _range},
+    },
+    {
+        "name": "users.by_username",
+        "collection": users_collection,
+        "filter": {"username": "username"},
+    },
+    {
+        "name": "products.by_id",
+        "collection": products_collection,
+        "filter": {"id": 1},
+    },
+    {
+        "name": "products.by_category_price",
+        "collection": products_collection,
+        "filter": {"category": "category", "price": {"$gte": 0, "$lte": 100}},
+        "sort": [("price", ASCENDING), ("id", ASCENDING)],
+    },
+]
+
+
+def plan_stages(plan) -> list[str]:
+    """Collect every stage name in an explain plan, depth first."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(plan_stages(value))
+    return stages
+
+
+async def explain_hot_queries() -> list[dict]:
+    report = []
+    for query in HOT_QUERIES:
+        cursor = query["collection"].find(query["filter"]).limit(DEFAULT_PAGE_SIZE + 1)
+        if "sort" in query:
+            cursor = cursor.sort(query["sort"])
+        explain = await cursor.explain()
+        stages = plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        report.append(
+            {
+                "query": query["name"],
+                "collection": query["collection"].name,
+                "stages": stages,
+                "collection_scan": "COLLSCAN" in stages,
+            }
+        )
+    return report
@@ -1,7 +1,28 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
+from pymongo.errors import ConnectionFailure, PyMongoError
 from starlette.middleware.cors import CORSMiddleware
 
-from app.database import users_collection
+from app.database import (
+    close_mongo_connection,
+    connect_to_mongo,
+    ping as mongo_ping,
+    pool_stats,
+    warm_up_pool,
+)
+from app.serialization import FastJSONResponse
+from app import metrics
+from app.profiling import QueryBudgetMiddleware
+from app.indexes import ensure_indexes
+from app.auth.service import hash_pool
+from app.vendors.service import vendor_registry
+from app.users.service import user_cache
+from app.reporting.cache import summary_cache
+from app.reporting.rollups import bootstrap_rollups
+from app.reporting.pdf import pdf_pool
+from app.reporting.jobs import export_jobs
 from app.auth.router import router as auth_router
 from app.users.router import router as users_router
 from app.orders.router import router as orders_router
@@ -9,9 +30,110 @@ from app.calendar.router import router as calendar_router
 from app.vendors.router import router as vendors_router
 from app.reporting.router import router as reporting_router
 from app.products.router import router as products_router
+from app.admin.router import router as admin_router
+
+logger = logging.getLogger(__name__)
 
 
-app = FastAPI()
+# ---------- Metrics ----------
+# Pools and caches keep their own counters; these read them at scrape time
+metrics.Gauge(
+    "mongodb_pool_connections",
+    "MongoDB driver connections by state.",
+    ("state",),
+    collect=lambda: {
+        ("open",): pool_stats.open,
+        ("checked_out",): pool_stats.checked_out,
+    },
+)
+metrics.Gauge(
+    "mongodb_pool_max_size",
+    "maxPoolSize of the MongoDB client.",
+    collect=lambda: {(): pool_stats.snapshot()["max_pool_size"]},
+)
+metrics.Counter(
+    "mongodb_pool_check_out_failures_total",
+    "Connection check-outs that failed or timed out waiting for a connection.",
+    collect=lambda: {(): pool_stats.check_out_failures},
+)
+metrics.Gauge(
+    "password_hash_tasks",
+    "Argon2 calls waiting for or running on a hashing worker.",
+    ("state",),
+    collect=lambda: {
+        ("queued",): hash_pool.stats()["queued"],
+        ("running",): hash_pool.stats()["running"],
+    },
+)
+metrics.Counter(
+    "cache_lookups_total",
+    "In-process cache lookups by cache and result.",
+    ("cache", "result"),
+    collect=lambda: {
+        ("user", "hit"): user_cache.hits,
+        ("user", "miss"): user_cache.misses,
+        ("summary", "hit"): summary_cache.hits,
+        ("summary", "miss"): summary_cache.misses,
+    },
+)
+metrics.Gauge(
+    "cache_entries",
+    "Entries currently held by in-process caches.",
+    ("cache",),
+    collect=lambda: {
+        ("user",): user_cache.stats()["size"],
+        ("summary",): summary_cache.stats()["size"],
+    },
+)
+
+
+async def prepare_database():
+    """Indexes, rollups and vendor registry; each step survives its own failure."""
+    await ensure_indexes()
+    try:
+        await bootstrap_rollups()
+    except PyMongoError as exc:
+        logger.error(
+            "Could not bootstrap order_rollups, reports may miss existing orders "
+            "until `python -m migrations.rebuild_order_rollups` is run: %s",
+            exc,
+        )
+    try:
+        await vendor_registry.load()
+    except PyMongoError as exc:
+        # The registry loads itself on first use instead
+        logger.error("Could not preload vendor registry: %s", exc)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One client per process, created inside the running event loop
+    await connect_to_mongo()
+    reachable = True
+    try:
+        await warm_up_pool()
+    except ConnectionFailure as exc:
+        # Each setup step would wait out its own server selection timeout
+        reachable = False
+        logger.error(
+            "MongoDB is unreachable, starting without index, rollup and vendor setup "
+            "(restart once it is back): %s",
+            exc,
+        )
+    except PyMongoError as exc:
+        # Connections are opened on demand instead
+        logger.error("Could not warm up the MongoDB pool: %s", exc)
+    if reachable:
+        await prepare_database()
+    await export_jobs.start()
+    yield
+    await export_jobs.stop()
+    hash_pool.shutdown()
+    pdf_pool.shutdown()
+    await close_mongo_connection()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +145,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryBudgetMiddleware)
+# Added last so it wraps everything, including CORS preflight responses
+app.add_middleware(metrics.MetricsMiddleware)
 
 app.include_router(auth_router)
 app.include_router(users_router)
@@ -31,6 +156,7 @@ app.include_router(vendors_router)
 app.include_router(products_router)
 app.include_router(calendar_router)
 app.include_router(reporting_router)
+app.include_router(admin_router)
 
 
 @app.get("/ping")
@@ -40,5 +166,10 @@ def ping():
 
 @app.get("/db-ping")
 async def db_ping():
-    await users_collection.find_one({})
-    return {"message":"db pong"}
+    latency_ms = await mongo_ping()
+    return {"message": "db pong", "latency_ms": round(latency_ms, 2), "pool": pool_stats.snapshot()}
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
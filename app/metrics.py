@@ -0,0 +1,232 @@
+"""In-process metrics, exposed in the Prometheus text exposition format.
+
+Metrics register themselves on creation and `render()` formats all of them
+for `/metrics`. Values live in this process only, so with several workers
+each one reports its own.
+"""
+import math
+import threading
+import time
+
+from pymongo.monitoring import CommandListener
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; from sub-millisecond cache hits up to slow report exports
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_registry = []
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """Yield (suffix, labels, value) for every exposed line."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{format_labels(labels)} {format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Incremented directly, or read at scrape time from `collect` ({label values: value})."""
+
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=(), collect=None):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+        self._collect = collect
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        if self._collect is not None:
+            values = list(self._collect().items())
+        else:
+            with self._lock:
+                values = list(self._values.items())
+        for key, value in values:
+            yield "", dict(zip(self.labelnames, key)), value
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        # label values -> [per-bucket counts, sum, count]
+        self._values = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        with self._lock:
+            values = [(key, list(counts), total, count) for key, (counts, total, count) in self._values.items()]
+        for key, counts, total, count in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield "_bucket", {**labels, "le": format_value(bound)}, cumulative
+            yield "_sum", labels, total
+            yield "_count", labels, count
+
+
+def render() -> str:
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# ---------- HTTP ----------
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of the response.",
+    ("method", "route", "status"),
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled.",
+    ("method",),
+)
+
+
+class MetricsMiddleware:
+    """Times every HTTP request by route template, e.g. /orders/{order_id}."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec(method=method)
+            # The router stores the matched route in the scope; unmatched
+            # paths share one label so scanners can't blow up cardinality
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                method=method,
+                route=getattr(route, "path", "<unmatched>"),
+                status=status_code,
+            )
+
+
+# ---------- MongoDB ----------
+mongo_command_duration = Histogram(
+    "mongodb_command_duration_seconds",
+    "Server round-trip time of MongoDB commands, by collection and command name.",
+    ("collection", "command", "outcome"),
+)
+
+
+class CommandMetrics(CommandListener):
+    """Feeds `mongo_command_duration` from pymongo command monitoring events."""
+
+    def __init__(self):
+        # (connection, request id) -> collection, until the command finishes
+        self._pending = {}
+
+    def started(self, event):
+        command = event.command
+        if event.command_name == "getMore":
+            collection = command.get("collection")
+        else:
+            collection = command.get(event.command_name)
+        if not isinstance(collection, str):
+            # Database-level commands (ping, aggregate: 1, ...)
+            collection = ""
+        self._pending[(event.connection_id, event.request_id)] = collection
+
+    def _finish(self, event, outcome: str):
+        collection = self._pending.pop((event.connection_id, event.request_id), "")
+        mongo_command_duration.observe(
+            event.duration_micros / 1_000_000,
+            collection=collection,
+            command=event.command_name,
+            outcome=outcome,
+        )
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "failure")
+
+
+command_metrics = CommandMetrics()
+
+
+# ---------- Password hashing ----------
+password_hash_duration = Histogram(
+    "password_hash_duration_seconds",
+    "CPU time of Argon2 hash and verify calls, excluding time queued for a worker.",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
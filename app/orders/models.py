@@ -42,3 +42,16 @@ class OrderResponse(BaseModel):
     special_instructions: str | None = None
     due_at: datetime | None = None
 
+
+# Page of orders returned by the list endpoint
+class OrderPage(BaseModel):
+    items: List[OrderResponse]
+    next: str | None = None
+
+
+# Per-item outcome of a bulk order creation
+class BulkOrderResult(BaseModel):
+    index: int
+    ok: bool
+    order: OrderResponse | None = None
+    error: str | None = None
@@ -1,12 +1,27 @@
-from datetime import datetime
 from typing import Annotated, List
 from bson import ObjectId
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 
-from app.database import orders_collection, vendors_collection
+from app.database import orders_collection
 from app.auth.service import get_current_active_user
-from app.orders.models import OrderCreate, OrderUpdate, OrderResponse
+from app.orders.models import OrderCreate, OrderUpdate, OrderResponse, OrderPage, BulkOrderResult
+from app.fields import mongo_projection, parse_fields
+from app.orders.service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_BULK_ORDERS,
+    MAX_PAGE_SIZE,
+    ORDER_FIELDS,
+    decode_cursor,
+    encode_cursor,
+    serialize_order,
+)
+from app.reporting.rollups import apply_rollup_changes, rollup_changed
+from app.serialization import FastJSONResponse, bson_datetime
+from app.streaming import ndjson_response, wants_stream
 from app.users.models import User
+from app.vendors.service import vendor_registry
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
@@ -17,24 +32,20 @@ def validate_object_id(id: str) -> ObjectId:
     return ObjectId(id)
 
 
-def serialize_order(order) -> dict:
-    order_date = order.get("order_date")
-    if isinstance(order_date, datetime):
-        order_date = order_date.isoformat()
-    due_at = order.get("due_at")
-    if isinstance(due_at, datetime):
-        due_at = due_at.isoformat()
-    return {
-        "id": str(order["_id"]),
-        "vendor_id": str(order["vendor_id"]),
-        "user_id": str(order.get("user_id", "")),
-        "order_date": order_date,
-        "items": order["items"],
-        "status": order["status"],
-        "total_amount": order.get("total_amount", 0),
-        "special_instructions": order.get("special_instructions"),
-        "due_at": due_at,
-    }
+def ownership_filter(current_user: User) -> dict:
+    """Restrict order queries to the caller's own orders unless they are an admin."""
+    if current_user.role == "admin":
+        return {}
+    user_identifier = str(current_user.id) if current_user.id else None
+    possible_ids = [value for value in [user_identifier, current_user.username] if value]
+    return {"user_id": {"$in": possible_ids}} if possible_ids else {"user_id": ""}
+
+
+async def raise_not_found_or_forbidden(oid: ObjectId):
+    """Explain why an ownership-filtered write matched nothing."""
+    if await orders_collection.find_one({"_id": oid}, {"_id": 1}):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    raise HTTPException(status_code=404, detail="Order not found")
 
 
 # ---------- CREATE ORDER ----------
@@ -44,8 +55,7 @@ async def create_order(
     current_user: Annotated[User, Depends(get_current_active_user)],
 ):
     vendor_id = validate_object_id(order.vendor_id)
-    vendor = await vendors_collection.find_one({"_id": vendor_id})
-    if not vendor:
+    if not await vendor_registry.exists(vendor_id):
         raise HTTPException(status_code=400, detail="Vendor does not exist")
 
     total = sum(item.price * item.quantity for item in order.items)
@@ -53,23 +63,119 @@ async def create_order(
     order_dict["user_id"] = current_user.username or str(current_user.id)
     order_dict["vendor_id"] = vendor_id
     order_dict["total_amount"] = total
+    order_dict["order_date"] = bson_datetime(order_dict["order_date"])
+    order_dict["due_at"] = bson_datetime(order_dict["due_at"])
+
+    # insert_one fills in order_dict["_id"], so there is nothing to read back
+    await orders_collection.insert_one(order_dict)
+    await apply_rollup_changes(added=[order_dict])
+    return serialize_order(order_dict)
+
+
+# ---------- BULK CREATE ORDERS ----------
+@router.post("/bulk", response_model=List[BulkOrderResult])
+async def create_orders_bulk(
+    orders: List[OrderCreate],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+):
+    if len(orders) > MAX_BULK_ORDERS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BULK_ORDERS} orders per request"
+        )
 
-    result = await orders_collection.insert_one(order_dict)
-    new_order = await orders_collection.find_one({"_id": result.inserted_id})
-    return serialize_order(new_order)
+    results = [None] * len(orders)
+    vendor_ids = {}
+    for index, order in enumerate(orders):
+        if ObjectId.is_valid(order.vendor_id):
+            vendor_ids[index] = ObjectId(order.vendor_id)
+        else:
+            results[index] = {"index": index, "ok": False, "error": "Invalid ID format"}
+
+    # One lookup for every vendor referenced in the batch
+    missing_vendors = await vendor_registry.missing(set(vendor_ids.values()))
+
+    user_id = current_user.username or str(current_user.id)
+    docs, doc_indexes = [], []
+    for index, vendor_id in vendor_ids.items():
+        if vendor_id in missing_vendors:
+            results[index] = {"index": index, "ok": False, "error": "Vendor does not exist"}
+            continue
+        order = orders[index]
+        order_dict = order.model_dump()
+        order_dict["user_id"] = user_id
+        order_dict["vendor_id"] = vendor_id
+        order_dict["total_amount"] = sum(item.price * item.quantity for item in order.items)
+        order_dict["order_date"] = bson_datetime(order_dict["order_date"])
+        order_dict["due_at"] = bson_datetime(order_dict["due_at"])
+        docs.append(order_dict)
+        doc_indexes.append(index)
+
+    write_errors = {}
+    if docs:
+        try:
+            await orders_collection.insert_many(docs, ordered=False)
+        except BulkWriteError as exc:
+            write_errors = {
+                error["index"]: error["errmsg"] for error in exc.details["writeErrors"]
+            }
+
+    created = []
+    for position, (index, order_dict) in enumerate(zip(doc_indexes, docs)):
+        if position in write_errors:
+            results[index] = {"index": index, "ok": False, "error": write_errors[position]}
+        else:
+            created.append(order_dict)
+            results[index] = {"index": index, "ok": True, "order": serialize_order(order_dict)}
+    await apply_rollup_changes(added=created)
+    return FastJSONResponse(results)
 
 
 # ---------- GET ORDERS ----------
-@router.get("/", response_model=List[OrderResponse])
-async def get_orders(current_user: Annotated[User, Depends(get_current_active_user)]):
-    if current_user.role == "admin":
-        query = {}
-    else:
-        user_identifier = str(current_user.id) if current_user.id else None
-        possible_ids = [value for value in [user_identifier, current_user.username] if value]
-        query = {"user_id": {"$in": possible_ids}} if possible_ids else {"user_id": ""}
-    orders = await orders_collection.find(query).to_list(length=None)
-    return [serialize_order(order) for order in orders]
+@router.get("/", response_model=OrderPage)
+async def get_orders(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    next_cursor: str | None = Query(None, alias="next", description="Cursor returned by the previous page"),
+    status: str | None = Query(None),
+    vendor_id: str | None = Query(None),
+    stream: bool = Query(False, description="Stream every matching order as NDJSON"),
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,status,due_at"),
+):
+    query = ownership_filter(current_user)
+    if status is not None:
+        query["status"] = status
+    if vendor_id is not None:
+        query["vendor_id"] = validate_object_id(vendor_id)
+    if next_cursor is not None:
+        query = {"$and": [query, decode_cursor(next_cursor)]}
+
+    field_list = parse_fields(fields, ORDER_FIELDS)
+    # order_date is always read because the pagination cursor is built from it
+    projection = mongo_projection(field_list, always=("order_date",)) if field_list else None
+
+    sort = [("order_date", -1), ("_id", -1)]
+    if wants_stream(request, stream):
+        # Streaming ignores the page size and walks the whole result set
+        return ndjson_response(
+            orders_collection.find(query, projection).sort(sort),
+            lambda order: serialize_order(order, field_list),
+        )
+
+    # Fetch one extra order to know whether another page exists
+    cursor = (
+        orders_collection.find(query, projection)
+        .sort(sort)
+        .limit(limit + 1)
+    )
+    orders = await cursor.to_list(length=limit + 1)
+    next_token = encode_cursor(orders[limit - 1]) if len(orders) > limit else None
+    return FastJSONResponse(
+        {
+            "items": [serialize_order(order, field_list) for order in orders[:limit]],
+            "next": next_token,
+        }
+    )
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
@@ -97,23 +203,32 @@ async def update_order(
     current_user: Annotated[User, Depends(get_current_active_user)],
 ):
     oid = validate_object_id(order_id)
-    existing = await orders_collection.find_one({"_id": oid})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Order not found")
-    if current_user.role != "admin":
-        user_identifier = str(current_user.id) if current_user.id else None
-        allowed_ids = [value for value in [user_identifier, current_user.username] if value]
-        if existing.get("user_id") not in allowed_ids:
-            raise HTTPException(status_code=403, detail="Not authorized")
-
-    update_dict = {k: v for k, v in updated.model_dump(exclude_none=True).items()}
+    # Dates are stored as BSON would round them, so the replayed response matches
+    update_dict = {k: bson_datetime(v) for k, v in updated.model_dump(exclude_none=True).items()}
     if "items" in update_dict:
         update_dict["total_amount"] = sum(
             item["price"] * item["quantity"] for item in update_dict["items"]
         )
-
-    await orders_collection.update_one({"_id": oid}, {"$set": update_dict})
-    updated_order = await orders_collection.find_one({"_id": oid})
+    if "vendor_id" in update_dict:
+        update_dict["vendor_id"] = validate_object_id(update_dict["vendor_id"])
+
+    query = {"_id": oid, **ownership_filter(current_user)}
+    if not update_dict:
+        existing = await orders_collection.find_one(query)
+        if not existing:
+            await raise_not_found_or_forbidden(oid)
+        return serialize_order(existing)
+
+    # Take the pre-image so the rollups can move the order between buckets;
+    # the $set is simple enough to replay locally for the response
+    previous = await orders_collection.find_one_and_update(
+        query, {"$set": update_dict}, return_document=ReturnDocument.BEFORE
+    )
+    if not previous:
+        await raise_not_found_or_forbidden(oid)
+    updated_order = {**previous, **update_dict}
+    if rollup_changed(previous, updated_order):
+        await apply_rollup_changes(added=[updated_order], removed=[previous])
     return serialize_order(updated_order)
 
 
@@ -124,18 +239,10 @@ async def delete_order(
     current_user: Annotated[User, Depends(get_current_active_user)],
 ):
     oid = validate_object_id(order_id)
-    existing = await orders_collection.find_one({"_id": oid})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Order not found")
-    if current_user.role != "admin":
-        user_identifier = str(current_user.id) if current_user.id else None
-        allowed_ids = [value for value in [user_identifier, current_user.username] if value]
-        if existing.get("user_id") not in allowed_ids:
-            raise HTTPException(status_code=403, detail="Not authorized")
-
-    await orders_collection.delete_one({"_id": oid})
+    deleted = await orders_collection.find_one_and_delete(
+        {"_id": oid, **ownership_filter(current_user)}
+    )
+    if not deleted:
+        await raise_not_found_or_forbidden(oid)
+    await apply_rollup_changes(removed=[deleted])
     return {"message": "Order deleted successfully"}
-
-
-
-
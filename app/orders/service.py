@@ -1,11 +1,74 @@
-def serialize_order(order) -> dict:
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BULK_ORDERS = 500
+
+
+def isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+# How each OrderResponse field is read off an orders document
+ORDER_FIELDS = {
+    "id": lambda order: str(order["_id"]),
+    "vendor_id": lambda order: str(order["vendor_id"]),
+    "user_id": lambda order: str(order.get("user_id", "")),
+    "order_date": lambda order: isoformat(order.get("order_date")),
+    "items": lambda order: order["items"],
+    "status": lambda order: order["status"],
+    "total_amount": lambda order: order.get("total_amount", 0),
+    "special_instructions": lambda order: order.get("special_instructions"),
+    "due_at": lambda order: isoformat(order.get("due_at")),
+}
+
+
+def serialize_order(order, fields: list[str] | None = None) -> dict:
+    """Turn an orders document into the API shape, limited to `fields` when given."""
+    if fields:
+        return {name: ORDER_FIELDS[name](order) for name in fields}
+    # Unrolled copy of ORDER_FIELDS: this runs for every order in every list response
     return {
         "id": str(order["_id"]),
         "vendor_id": str(order["vendor_id"]),
-        "order_date": str(order["order_date"]),
+        "user_id": str(order.get("user_id", "")),
+        "order_date": isoformat(order.get("order_date")),
         "items": order["items"],
         "status": order["status"],
         "total_amount": order.get("total_amount", 0),
         "special_instructions": order.get("special_instructions"),
-        "due_at": str(order.get("due_at")) if order.get("due_at") else None,
+        "due_at": isoformat(order.get("due_at")),
+    }
+
+
+def encode_cursor(order: dict) -> str:
+    """Build the opaque `next` token pointing just past the given order."""
+    payload = {"d": order["order_date"].isoformat(), "i": str(order["_id"])}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> dict:
+    """Turn a `next` token back into a keyset filter on (order_date, _id)."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        order_date = datetime.fromisoformat(payload["d"])
+        oid = ObjectId(payload["i"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    # Orders are listed newest first, so the next page holds everything
+    # strictly "before" the last order returned.
+    return {
+        "$or": [
+            {"order_date": {"$lt": order_date}},
+            {"order_date": order_date, "_id": {"$lt": oid}},
+        ]
     }
@@ -1,5 +1,5 @@
 from datetime import UTC, datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field, HttpUrl
 
@@ -14,3 +14,18 @@ class Product(BaseModel):
     image: Optional[HttpUrl] = None
     rating: Optional[dict] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+# Filtering, sorting and paging options for the catalog
+ProductSort = Literal["id", "price", "-price", "rating", "-rating", "title"]
+
+
+class ProductFilters(BaseModel):
+    category: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_rating: Optional[float] = None
+    q: Optional[str] = None
+    sort: Optional[ProductSort] = None
+    limit: Optional[int] = None
+    offset: int = 0
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException, Path
-from typing import List
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+from typing import List, Optional
 
-from app.products.models import Product
+from app.products.models import Product, ProductFilters, ProductSort
+from app.serialization import FastJSONResponse
+from app.streaming import ndjson_response, wants_stream
 from app.products.service import (
-    get_all_products,
+    iter_products,
+    product_catalog,
+    search_products,
     get_product_by_id,
     create_product,
     update_product,
@@ -16,17 +20,66 @@ router = APIRouter(
 )
 
 
+# ---------- Helpers ----------
+def etag_response(request: Request, body: bytes, etag: str) -> Response:
+    """Serve pre-encoded JSON, or an empty 304 when the client already has this version."""
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in client_tags or etag.removeprefix("W/") in client_tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
 # ---------- ROUTES ----------
 
 @router.get("/", response_model=List[Product])
-async def read_products():
-    """Get all products."""
-    return await get_all_products()
+async def read_products(
+    request: Request,
+    category: Optional[str] = Query(None),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    q: Optional[str] = Query(None, description="Text search over title and description"),
+    sort: Optional[ProductSort] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    stream: bool = Query(False, description="Stream every product as NDJSON"),
+):
+    """Get all products, optionally filtered, searched, sorted and paged."""
+    filters = ProductFilters(
+        category=category,
+        min_price=min_price,
+        max_price=max_price,
+        min_rating=min_rating,
+        q=q,
+        sort=sort,
+        limit=limit,
+        offset=offset,
+    )
+    filtered = bool(filters.model_dump(exclude_defaults=True))
+    if wants_stream(request, stream):
+        # Product models are encoded as-is by the streaming JSON encoder
+        return ndjson_response(iter_products(filters if filtered else None), lambda p: p)
+    if filtered:
+        return FastJSONResponse(await search_products(filters))
+
+    # The unfiltered catalog comes straight from the in-memory snapshot
+    await product_catalog.refresh_if_stale()
+    return etag_response(request, product_catalog.body, product_catalog.etag)
 
 
 @router.get("/{product_id}", response_model=Product)
-async def read_product(product_id: int = Path(..., description="ID of the product to retrieve")):
+async def read_product(
+    request: Request,
+    product_id: int = Path(..., description="ID of the product to retrieve"),
+):
     """Get a single product by ID."""
+    await product_catalog.refresh_if_stale()
+    cached = product_catalog.items.get(product_id)
+    if cached:
+        return etag_response(request, *cached)
+
+    # Possibly created on another worker since the last snapshot
     product = await get_product_by_id(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
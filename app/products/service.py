@@ -1,15 +1,105 @@
-from typing import List, Optional
+import hashlib
+from typing import AsyncIterator, List, Optional
 
-from app.database import products_collection
-from app.products.models import Product
+import bson
+from decouple import config
 
+from app.cache import PeriodicSnapshot
+from app.database import products_collection
+from app.products.models import Product, ProductFilters
+
+PRODUCT_CATALOG_TTL_SECONDS = config("PRODUCT_CATALOG_TTL_SECONDS", default=60, cast=float)
+
+
+class ProductCatalog(PeriodicSnapshot):
+    """In-process snapshot of the catalog, held as already-encoded JSON.
+
+    The ETag is derived from the stored documents rather than the encoded
+    bytes, so it stays stable across rebuilds and workers while the data is
+    unchanged (defaults such as `created_at` are filled in at encode time).
+    """
+
+    def __init__(self, ttl: float):
+        super().__init__(ttl)
+        self.body = b"[]"
+        self.etag = ""
+        self.items: dict[int, tuple[bytes, str]] = {}
+
+    async def _fetch(self):
+        docs = await products_collection.find({}).sort("id", 1).to_list(length=None)
+        items = {}
+        catalog_hash = hashlib.sha256()
+        for doc in docs:
+            raw = bson.encode(doc)
+            catalog_hash.update(raw)
+            product = Product(**doc)
+            items[product.id] = (
+                product.model_dump_json().encode(),
+                f'W/"{hashlib.sha256(raw).hexdigest()[:32]}"',
+            )
+        self.items = items
+        self.body = b"[" + b",".join(body for body, _ in items.values()) + b"]"
+        self.etag = f'W/"{catalog_hash.hexdigest()[:32]}"'
+
+
+product_catalog = ProductCatalog(PRODUCT_CATALOG_TTL_SECONDS)
+
+
+SORT_FIELDS = {
+    "id": [("id", 1)],
+    "price": [("price", 1), ("id", 1)],
+    "-price": [("price", -1), ("id", 1)],
+    "rating": [("rating.rate", 1), ("id", 1)],
+    "-rating": [("rating.rate", -1), ("id", 1)],
+    "title": [("title", 1), ("id", 1)],
+}
+
+
+def find_products(filters: ProductFilters | None = None):
+    """Build a cursor for the catalog, narrowed and ordered by `filters`."""
+    if filters is None:
+        return products_collection.find({})
+
+    query = {}
+    if filters.category is not None:
+        query["category"] = filters.category
+    if filters.min_price is not None or filters.max_price is not None:
+        query["price"] = {}
+        if filters.min_price is not None:
+            query["price"]["$gte"] = filters.min_price
+        if filters.max_price is not None:
+            query["price"]["$lte"] = filters.max_price
+    if filters.min_rating is not None:
+        query["rating.rate"] = {"$gte": filters.min_rating}
+
+    if filters.q:
+        query["$text"] = {"$search": filters.q}
+        cursor = products_collection.find(query, {"score": {"$meta": "textScore"}})
+        # Best matches first unless the caller asked for another order
+        sort = SORT_FIELDS[filters.sort] if filters.sort else [("score", {"$meta": "textScore"})]
+    else:
+        cursor = products_collection.find(query)
+        sort = SORT_FIELDS[filters.sort or "id"]
+
+    cursor = cursor.sort(sort).skip(filters.offset)
+    if filters.limit is not None:
+        cursor = cursor.limit(filters.limit)
+    return cursor
+
+
+async def search_products(filters: ProductFilters) -> List[Product]:
+    products = await find_products(filters).to_list(length=None)
+    return [Product(**p) for p in products]
 
-async def get_all_products() -> List[Product]:
-    cursor = products_collection.find({})
-    products = await cursor.to_list(length=None)
 
-    # Convert MongoDB docs into Product models
-    return [Product(**p) for p in products]
+async def iter_products(filters: ProductFilters | None = None) -> AsyncIterator[Product]:
+    # Yield products one at a time so callers can stream the catalog
+    cursor = find_products(filters)
+    try:
+        async for p in cursor:
+            yield Product(**p)
+    finally:
+        await cursor.close()
 
 
 async def get_product_by_id(product_id: int) -> Optional[Product]:
@@ -25,6 +115,7 @@ async def create_product(product: Product) -> Product:
     product_dict.pop("_id", None)
 
     await products_collection.insert_one(product_dict)
+    product_catalog.invalidate()
 
     return Product(**product_dict)
 
@@ -42,9 +133,15 @@ async def update_product(
         {"$set": updated_dict}
     )
 
-    return updated_product if result.matched_count > 0 else None
+    if result.matched_count == 0:
+        return None
+    product_catalog.invalidate()
+    return updated_product
 
 
 async def delete_product(product_id: int) -> bool:
     result = await products_collection.delete_one({"id": product_id})
-    return result.deleted_count > 0
+    if result.deleted_count == 0:
+        return False
+    product_catalog.invalidate()
+    return True
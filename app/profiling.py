@@ -0,0 +1,206 @@
+"""Per-request MongoDB accounting and slow-query logging.
+
+`QueryBudgetMiddleware` gives every request a `QueryBudget` through a
+context variable. `QueryProfiler`, registered as a pymongo command listener,
+charges each command to it, so responses carry their round trips and DB time
+in a `Server-Timing` header. Any command slower than SLOW_QUERY_MS is logged
+with the shape of its filter and, in the background, its explain plan.
+"""
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+
+from decouple import config
+from pymongo.errors import PyMongoError
+from pymongo.monitoring import CommandListener
+
+SLOW_QUERY_MS = config("SLOW_QUERY_MS", default=100, cast=float)
+QUERY_BUDGET_PER_REQUEST = config("QUERY_BUDGET_PER_REQUEST", default=10, cast=int)
+# The same slow query shape is explained at most once per interval
+SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS = config("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", default=60, cast=int)
+
+# Commands the server can explain, and where each keeps its filter
+EXPLAINABLE = {
+    "find": "filter",
+    "aggregate": "pipeline",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "update": "updates",
+    "delete": "deletes",
+}
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudget:
+    def __init__(self):
+        self.round_trips = 0
+        self.db_ms = 0.0
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_ms:.2f};desc="{self.round_trips} round trips"'
+
+
+current_budget: ContextVar[QueryBudget | None] = ContextVar("current_budget", default=None)
+
+
+# ---------- Helpers ----------
+def query_shape(value):
+    """The filter with every literal replaced by "?", keeping keys and operators."""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # $in lists and the like: one element is enough to show the shape
+        return [query_shape(value[0])] if value else []
+    return "?"
+
+
+def command_filter(command_name: str, command: dict):
+    if command_name not in EXPLAINABLE:
+        return None
+    value = command.get(EXPLAINABLE[command_name])
+    if command_name == "aggregate":
+        return [query_shape(stage) for stage in value or []]
+    if command_name in ("update", "delete"):
+        # One statement per write; the first shows the shape
+        value = value[0].get("q") if value else None
+    return query_shape(value)
+
+
+# ---------- Middleware ----------
+class QueryBudgetMiddleware:
+    """Adds Server-Timing to every response and warns about chatty handlers."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        budget = QueryBudget()
+        token = current_budget.set(budget)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                # Queries made while streaming the body come too late for this
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", budget.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_budget.reset(token)
+            if budget.round_trips > QUERY_BUDGET_PER_REQUEST:
+                route = scope.get("route")
+                logger.warning(
+                    "%s %s made %d MongoDB round trips (budget %d, %.1f ms)",
+                    scope["method"],
+                    getattr(route, "path", scope["path"]),
+                    budget.round_trips,
+                    QUERY_BUDGET_PER_REQUEST,
+                    budget.db_ms,
+                )
+
+
+# ---------- Command listener ----------
+class QueryProfiler(CommandListener):
+    def __init__(self):
+        # (connection, request id) -> (database, command), until the command finishes
+        self._pending = {}
+        self._last_explained = {}
+        self._tasks = set()
+
+    def started(self, event):
+        # Explains issued for slow queries are not slow queries themselves
+        if event.command_name != "explain":
+            self._pending[(event.connection_id, event.request_id)] = (
+                event.database_name,
+                event.command,
+            )
+
+    def _finish(self, event):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        duration_ms = event.duration_micros / 1000
+
+        budget = current_budget.get()
+        if budget is not None:
+            budget.round_trips += 1
+            budget.db_ms += duration_ms
+
+        if pending is None or duration_ms < SLOW_QUERY_MS:
+            return
+        database_name, command = pending
+        collection = command.get("collection" if event.command_name == "getMore" else event.command_name)
+        shape = command_filter(event.command_name, command)
+        logger.warning(
+            "Slow MongoDB %s on %s.%s took %.1f ms, filter %s",
+            event.command_name,
+            database_name,
+            collection,
+            duration_ms,
+            shape,
+        )
+        if event.command_name in EXPLAINABLE:
+            self._schedule_explain(database_name, event.command_name, command, collection, shape)
+
+    def _schedule_explain(self, database_name, command_name, command, collection, shape):
+        key = (database_name, collection, command_name, repr(shape))
+        now = time.monotonic()
+        last = self._last_explained.get(key)
+        if last is not None and now - last < SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not on an event loop (e.g. a synchronous script); skip the plan
+            return
+        self._last_explained[key] = now
+        task = loop.create_task(explain_command(database_name, command_name, command))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+
+query_profiler = QueryProfiler()
+
+
+async def explain_command(database_name: str, command_name: str, command: dict):
+    # Imported here: app.database registers this module's listener
+    from app import database
+    from app.indexes import plan_stages
+
+    # The explain's own round trip is not the request's doing
+    current_budget.set(None)
+    if database.client is None:
+        return
+    # Session, cluster time and other driver-added fields can't be explained
+    explained = {key: value for key, value in command.items() if not key.startswith("$") and key != "lsid"}
+    if command_name in ("update", "delete"):
+        # The server only explains single-statement writes
+        field = EXPLAINABLE[command_name]
+        explained[field] = explained[field][:1]
+    try:
+        plan = await database.client[database_name].command(
+            {"explain": explained, "verbosity": "queryPlanner"}
+        )
+    except PyMongoError as exc:
+        logger.warning("Could not explain slow %s: %s", command_name, exc)
+        return
+    winning_plan = plan.get("queryPlanner", {}).get("winningPlan", {})
+    logger.warning(
+        "Plan for slow %s on %s.%s: %s",
+        command_name,
+        database_name,
+        command.get(command_name),
+        " <- ".join(plan_stages(winning_plan)) or winning_plan,
+    )
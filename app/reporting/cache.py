@@ -0,0 +1,41 @@
+from decouple import config
+
+from app.cache import TTLCache
+
+SUMMARY_CACHE_MAX_ENTRIES = config("SUMMARY_CACHE_MAX_ENTRIES", default=128, cast=int)
+SUMMARY_CACHE_TTL_SECONDS = config("SUMMARY_CACHE_TTL_SECONDS", default=60, cast=float)
+
+
+class SummaryCache(TTLCache):
+    """Bounded LRU cache of summary results keyed by normalized date range.
+
+    Entries are tied to the orders data version at the time they were computed,
+    and every order write that changes the rollups bumps that version. The TTL
+    bounds how long writes made on other workers can go unnoticed.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        super().__init__(max_size, ttl)
+        self.data_version = 0
+
+    def bump_version(self) -> None:
+        self.data_version += 1
+
+    def _is_valid(self, value) -> bool:
+        return value[0] == self.data_version
+
+    def get(self, key: tuple) -> list | None:
+        entry = super().get(key)
+        return None if entry is None else entry[1]
+
+    def set(self, key: tuple, data: list, version: int) -> None:
+        # A write landed while computing `data`, so it is already stale
+        if version != self.data_version:
+            return
+        super().set(key, (version, data))
+
+    def stats(self) -> dict:
+        return {**super().stats(), "data_version": self.data_version}
+
+
+summary_cache = SummaryCache(SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_TTL_SECONDS)
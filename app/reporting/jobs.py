@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+from decouple import config
+from fastapi import HTTPException
+
+from app.database import orders_analytics_collection
+from app.reporting.models import ExportJob, ExportKind
+from app.reporting.pdf import pdf_pool
+from app.reporting.rollups import rollup_day
+from app.reporting.service import (
+    ORDERS_CSV_HEADER,
+    SUMMARY_CSV_HEADER,
+    encode_csv,
+    get_summary,
+    order_csv_rows,
+    order_range_query,
+    summary_csv_rows,
+)
+
+EXPORT_JOB_WORKERS = config("EXPORT_JOB_WORKERS", default=2, cast=int)
+EXPORT_JOB_QUEUE_SIZE = config("EXPORT_JOB_QUEUE_SIZE", default=32, cast=int)
+EXPORT_JOB_RETENTION_SECONDS = config("EXPORT_JOB_RETENTION_SECONDS", default=3600, cast=float)
+# Left empty (as in .env.example), exports go to the system temp directory
+EXPORT_DIR = config("EXPORT_DIR", default="") or os.path.join(
+    tempfile.gettempdir(), "optiflow-exports"
+)
+
+EXTENSIONS = {"summary_pdf": "pdf", "summary_csv": "csv", "orders_csv": "csv"}
+MEDIA_TYPES = {"pdf": "application/pdf", "csv": "text/csv"}
+
+logger = logging.getLogger(__name__)
+
+
+class ExportJobManager:
+    """Queue of report exports written to local disk by a fixed set of background workers.
+
+    Jobs live in this process only. Requests for a range and format that already
+    has a queued or running job are coalesced onto that job; finished jobs stay
+    downloadable by id but are never handed out again, as the data has moved on.
+    """
+
+    def __init__(self, workers: int, queue_size: int, directory: str, retention: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.directory = Path(directory)
+        self.retention = retention
+        self._jobs: dict[str, ExportJob] = {}
+        self._paths: dict[str, Path] = {}
+        self._by_key: dict[tuple, str] = {}
+        self._finished_at: dict[str, float] = {}
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(
+        self, kind: ExportKind, start: str, end: str, start_date: datetime, end_date: datetime
+    ) -> ExportJob:
+        self._purge_expired()
+        key = (kind, rollup_day(start_date), rollup_day(end_date))
+        existing = self._jobs.get(self._by_key.get(key))
+        if existing is not None and existing.status in ("queued", "running"):
+            return existing
+
+        if self._queue is None:
+            raise HTTPException(status_code=503, detail="Export workers are not running")
+        job = ExportJob(id=uuid.uuid4().hex, kind=kind, start=start, end=end)
+        try:
+            self._queue.put_nowait((job, start_date, end_date))
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="Too many export jobs queued, retry later")
+        self._jobs[job.id] = job
+        self._by_key[key] = job.id
+        return job
+
+    def get(self, job_id: str) -> ExportJob | None:
+        return self._jobs.get(job_id)
+
+    def file_for(self, job_id: str) -> tuple[Path, str]:
+        path = self._paths[job_id]
+        return path, MEDIA_TYPES[path.suffix.lstrip(".")]
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        for job_id, finished in list(self._finished_at.items()):
+            if now - finished < self.retention:
+                continue
+            job = self._jobs.pop(job_id)
+            self._finished_at.pop(job_id)
+            path = self._paths.pop(job_id, None)
+            if path is not None:
+                path.unlink(missing_ok=True)
+            self._by_key = {key: value for key, value in self._by_key.items() if value != job.id}
+
+    async def _worker(self):
+        while True:
+            job, start_date, end_date = await self._queue.get()
+            try:
+                await self._run(job, start_date, end_date)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: ExportJob, start_date: datetime, end_date: datetime):
+        job.status = "running"
+        path = self.directory / f"{job.id}.{EXTENSIONS[job.kind]}"
+        partial = path.with_suffix(path.suffix + ".part")
+        try:
+            if job.kind == "summary_pdf":
+                data = await get_summary(start_date, end_date)
+                job.total_rows = len(data)
+                pdf = await pdf_pool.render(data, job.start, job.end)
+                await asyncio.to_thread(partial.write_bytes, pdf)
+                job.rows_written = len(data)
+            else:
+                if job.kind == "orders_csv":
+                    header, rows = ORDERS_CSV_HEADER, order_csv_rows(start_date, end_date)
+                    job.total_rows = await orders_analytics_collection.count_documents(
+                        order_range_query(start_date, end_date)
+                    )
+                else:
+                    header, rows = SUMMARY_CSV_HEADER, summary_csv_rows(start_date, end_date)
+                await self._write_csv(job, partial, header, rows)
+            partial.replace(path)
+        except asyncio.CancelledError:
+            partial.unlink(missing_ok=True)
+            raise
+        except Exception as exc:
+            logger.exception("Export job %s failed", job.id)
+            partial.unlink(missing_ok=True)
+            job.status = "failed"
+            job.error = str(exc)
+        else:
+            self._paths[job.id] = path
+            job.status = "done"
+            job.progress = 1.0
+        job.finished_at = datetime.now(UTC)
+        self._finished_at[job.id] = time.monotonic()
+
+    async def _write_csv(self, job: ExportJob, path: Path, header: list[str], rows):
+        async def counted():
+            async for row in rows:
+                job.rows_written += 1
+                if job.total_rows:
+                    job.progress = min(job.rows_written / job.total_rows, 0.99)
+                yield row
+
+        with open(path, "wb") as output:
+            async for chunk in encode_csv(header, counted()):
+                await asyncio.to_thread(output.write, chunk)
+
+
+export_jobs = ExportJobManager(
+    EXPORT_JOB_WORKERS, EXPORT_JOB_QUEUE_SIZE, EXPORT_DIR, EXPORT_JOB_RETENTION_SECONDS
+)
@@ -0,0 +1,28 @@
+from datetime import UTC, datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+ExportKind = Literal["summary_pdf", "summary_csv", "orders_csv"]
+
+
+# Request body for queueing an export job
+class ExportJobCreate(BaseModel):
+    kind: ExportKind
+    start: str
+    end: str
+
+
+# Export job status, as reported by GET /reports/jobs/{id}
+class ExportJob(BaseModel):
+    id: str
+    kind: ExportKind
+    start: str
+    end: str
+    status: Literal["queued", "running", "done", "failed"] = "queued"
+    progress: float = 0.0
+    rows_written: int = 0
+    total_rows: int | None = None
+    error: str | None = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    finished_at: datetime | None = None
@@ -0,0 +1,79 @@
+import asyncio
+from io import BytesIO
+
+from decouple import config
+
+PDF_RENDER_WORKERS = config("PDF_RENDER_WORKERS", default=2, cast=int)
+PDF_CHUNK_SIZE = 64 * 1024
+
+
+def render_summary_pdf(data: list[dict], start: str, end: str) -> bytes:
+    # Runs in a worker process: keep it free of app state and database access.
+    # reportlab is imported here so only the render workers ever load it.
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+
+    p.setFont("Helvetica", 16)
+    p.drawString(50, 750, "Order Summary Report")
+    p.setFont("Helvetica", 12)
+    p.drawString(50, 730, f"Date Range: {start} to {end}")
+
+    y = 700
+    for row in data:
+        text = f"Vendor: {row['vendor_id']} | Status: {row['status']} | Orders: {row['total_orders']} | Amount: ${row['total_amount']:.2f}"
+        p.drawString(50, y, text)
+        y -= 20
+        if y < 40:
+            p.showPage()
+            y = 750
+
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+class PdfRenderPool:
+    """Renders PDFs in worker processes so large reports never block the event loop."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        # Created on the first render, like the process pool machinery imports
+        self._executor = None
+        # Excess renders wait here rather than in the executor queue, so a
+        # request that is cancelled while waiting never costs a worker
+        self._slots = asyncio.Semaphore(workers)
+
+    def _get_executor(self):
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def render(self, data: list[dict], start: str, end: str) -> bytes:
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), render_summary_pdf, data, start, end
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+pdf_pool = PdfRenderPool(PDF_RENDER_WORKERS)
+
+
+async def iter_chunks(content: bytes, chunk_size: int = PDF_CHUNK_SIZE):
+    view = memoryview(content)
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset : offset + chunk_size]
@@ -0,0 +1,148 @@
+import logging
+from collections import defaultdict
+from datetime import UTC, datetime
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from app.database import order_rollups_collection, orders_collection
+from app.reporting.cache import summary_cache
+
+logger = logging.getLogger(__name__)
+
+
+def rollup_day(value: datetime) -> datetime:
+    """Midnight of the UTC day `value` falls on, naive like dates read from Mongo."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def rollup_key(order: dict) -> tuple | None:
+    order_date = order.get("order_date")
+    if not isinstance(order_date, datetime):
+        return None
+    return rollup_day(order_date), order.get("vendor_id"), order.get("status")
+
+
+def rollup_changed(before: dict, after: dict) -> bool:
+    return rollup_key(before) != rollup_key(after) or before.get(
+        "total_amount", 0
+    ) != after.get("total_amount", 0)
+
+
+# Order writes keep `order_rollups` (count and amount per day, vendor_id and
+# status) current with $inc upserts. The increments are not transactional with
+# the order writes, so `rebuild_rollups` recomputes everything if they drift.
+async def apply_rollup_changes(added=(), removed=()):
+    """Add `added` orders to, and take `removed` orders out of, their daily rollups.
+
+    Never raises for database errors: they are logged and left to a rebuild.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for sign, orders in ((1, added), (-1, removed)):
+        for order in orders:
+            key = rollup_key(order)
+            if key is None:
+                continue
+            deltas[key][0] += sign
+            deltas[key][1] += sign * order.get("total_amount", 0)
+
+    now = datetime.now(UTC)
+    ops = [
+        UpdateOne(
+            {"day": day, "vendor_id": vendor_id, "status": status},
+            {
+                "$inc": {"count": count, "amount": amount},
+                # Lets a concurrent rebuild tell new buckets from stale ones
+                "$setOnInsert": {"rebuilt_at": now},
+            },
+            upsert=True,
+        )
+        for (day, vendor_id, status), (count, amount) in deltas.items()
+        if count or amount
+    ]
+    if not ops:
+        return
+    try:
+        await order_rollups_collection.bulk_write(ops, ordered=False)
+    except PyMongoError as exc:
+        # The order write itself already succeeded; failing the request now
+        # would only invite a retry that duplicates it
+        logger.error(
+            "Could not update order_rollups, reports may drift until "
+            "`python -m migrations.rebuild_order_rollups` is run: %s",
+            exc,
+        )
+    # Partial failures may still have changed some buckets
+    summary_cache.bump_version()
+
+
+async def rebuild_rollups():
+    """Recompute every rollup from the orders collection with a `$merge`.
+
+    Safe to run while orders are being written: buckets upserted after the
+    rebuild started are kept. An increment landing on a bucket between the
+    `$group` and its `$merge` replace can still be lost, so run it again
+    (or during a quiet period) if exact counts matter.
+    """
+    rebuilt_at = datetime.now(UTC)
+    pipeline = [
+        {"$match": {"order_date": {"$type": "date"}}},
+        {
+            "$group": {
+                "_id": {
+                    "day": {"$dateTrunc": {"date": "$order_date", "unit": "day"}},
+                    "vendor_id": "$vendor_id",
+                    "status": "$status",
+                },
+                "count": {"$sum": 1},
+                "amount": {"$sum": "$total_amount"},
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "day": "$_id.day",
+                "vendor_id": "$_id.vendor_id",
+                "status": "$_id.status",
+                "count": 1,
+                "amount": 1,
+                "rebuilt_at": {"$literal": rebuilt_at},
+            }
+        },
+        {
+            "$merge": {
+                "into": order_rollups_collection.name,
+                "on": ["day", "vendor_id", "status"],
+                "whenMatched": "replace",
+                "whenNotMatched": "insert",
+            }
+        },
+    ]
+    cursor = await orders_collection.aggregate(pipeline)
+    await cursor.to_list(length=None)
+
+    # Rollups the merge did not touch and that predate this rebuild have no
+    # orders behind them any more; newer ones came from live order writes.
+    # Buckets without a stamp were upserted before live writes set one.
+    result = await order_rollups_collection.delete_many(
+        {"$or": [{"rebuilt_at": {"$lt": rebuilt_at}}, {"rebuilt_at": {"$exists": False}}]}
+    )
+    summary_cache.bump_version()
+    return result.deleted_count
+
+
+async def bootstrap_rollups():
+    """Build the rollups on first start, when orders exist but no rollups do yet.
+
+    Reports read only `order_rollups`, so without this they would silently
+    leave out every order written before the rollups were introduced.
+    """
+    if await order_rollups_collection.find_one({}, {"_id": 1}):
+        return
+    if not await orders_collection.find_one({}, {"_id": 1}):
+        return
+    logger.warning("order_rollups is empty but orders exist; rebuilding rollups before serving reports")
+    await rebuild_rollups()
+    logger.warning("order_rollups rebuilt from existing orders")
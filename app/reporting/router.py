@@ -1,46 +1,18 @@
-import csv
 from datetime import datetime
-from io import BytesIO, StringIO
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import StreamingResponse
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
 
-from app.database import orders_collection
+from app.reporting.cache import summary_cache
+from app.reporting.jobs import export_jobs
+from app.reporting.models import ExportJob, ExportJobCreate
+from app.reporting.pdf import iter_chunks, pdf_pool
+from app.reporting.service import get_summary, orders_csv, summary_csv
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
 
 # ---------- Helpers ----------
-async def run_summary_pipeline(start_date: datetime, end_date: datetime):
-    pipeline = [
-        {"$match": {"order_date": {"$gte": start_date, "$lte": end_date}}},
-        {
-            "$group": {
-                "_id": {"vendor_id": "$vendor_id", "status": "$status"},
-                "total_orders": {"$sum": 1},
-                "total_amount": {"$sum": "$total_amount"},
-            }
-        },
-    ]
-
-    cursor = orders_collection.aggregate(pipeline)
-    results = []
-
-    async for row in cursor:
-        results.append(
-            {
-                "vendor_id": str(row["_id"]["vendor_id"]),
-                "status": row["_id"]["status"],
-                "total_orders": row["total_orders"],
-                "total_amount": row["total_amount"],
-            }
-        )
-
-    return results
-
-
 def parse_date(date_str: str) -> datetime:
     try:
         return datetime.fromisoformat(date_str)
@@ -54,42 +26,30 @@ async def get_order_summary(start: str = Query(...), end: str = Query(...)):
     start_date = parse_date(start)
     end_date = parse_date(end)
 
-    data = await run_summary_pipeline(start_date, end_date)
+    data = await get_summary(start_date, end_date)
     return data
 
 
+@router.get("/summary/cache")
+async def get_summary_cache_stats():
+    return summary_cache.stats()
+
+
 @router.get("/summary/pdf")
 async def export_summary_pdf(start: str = Query(...), end: str = Query(...)):
     start_date = parse_date(start)
     end_date = parse_date(end)
 
-    data = await run_summary_pipeline(start_date, end_date)
-
-    buffer = BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-
-    p.setFont("Helvetica", 16)
-    p.drawString(50, 750, "Order Summary Report")
-    p.setFont("Helvetica", 12)
-    p.drawString(50, 730, f"Date Range: {start} to {end}")
-
-    y = 700
-    for row in data:
-        text = f"Vendor: {row['vendor_id']} | Status: {row['status']} | Orders: {row['total_orders']} | Amount: ${row['total_amount']:.2f}"
-        p.drawString(50, y, text)
-        y -= 20
-        if y < 40:
-            p.showPage()
-            y = 750
+    data = await get_summary(start_date, end_date)
 
-    p.showPage()
-    p.save()
-
-    buffer.seek(0)
+    pdf = await pdf_pool.render(data, start, end)
     return StreamingResponse(
-        buffer,
+        iter_chunks(pdf),
         media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=summary.pdf"},
+        headers={
+            "Content-Disposition": "attachment; filename=summary.pdf",
+            "Content-Length": str(len(pdf)),
+        },
     )
 
 
@@ -98,25 +58,50 @@ async def export_summary_csv(start: str = Query(...), end: str = Query(...)):
     start_date = parse_date(start)
     end_date = parse_date(end)
 
-    data = await run_summary_pipeline(start_date, end_date)
+    return StreamingResponse(
+        summary_csv(start_date, end_date),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=summary.csv"},
+    )
 
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["vendor_id", "status", "total_orders", "total_amount"])
 
-    for row in data:
-        writer.writerow(
-            [
-                row["vendor_id"],
-                row["status"],
-                row["total_orders"],
-                f"{row['total_amount']:.2f}",
-            ]
-        )
+@router.get("/orders/csv")
+async def export_orders_csv(start: str = Query(...), end: str = Query(...)):
+    """Every order in the range, one CSV row each, streamed off the cursor."""
+    start_date = parse_date(start)
+    end_date = parse_date(end)
 
-    output.seek(0)
     return StreamingResponse(
-        iter([output.getvalue()]),
+        orders_csv(start_date, end_date),
         media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=summary.csv"},
+        headers={"Content-Disposition": "attachment; filename=orders.csv"},
     )
+
+
+@router.post("/jobs", response_model=ExportJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(job: ExportJobCreate):
+    """Queue an export; identical requests share a job until it finishes."""
+    start_date = parse_date(job.start)
+    end_date = parse_date(job.end)
+    return export_jobs.submit(job.kind, job.start, job.end, start_date, end_date)
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJob)
+async def get_export_job(job_id: str):
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(job_id: str):
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status}")
+    path, media_type = export_jobs.file_for(job_id)
+    # summary_pdf -> summary.pdf, orders_csv -> orders.csv
+    filename = job.kind.rsplit("_", 1)[0] + path.suffix
+    return FileResponse(path, media_type=media_type, filename=filename)
@@ -0,0 +1,127 @@
+import csv
+from datetime import datetime, timedelta
+from io import StringIO
+
+from app.database import order_rollups_analytics_collection, orders_analytics_collection
+from app.reporting.cache import summary_cache
+from app.reporting.rollups import rollup_day
+
+CSV_CHUNK_SIZE = 64 * 1024
+SUMMARY_CSV_HEADER = ["vendor_id", "status", "total_orders", "total_amount"]
+ORDERS_CSV_HEADER = [
+    "id",
+    "order_date",
+    "user_id",
+    "vendor_id",
+    "status",
+    "total_amount",
+    "due_at",
+]
+
+
+async def iter_summary_rows(start_date: datetime, end_date: datetime):
+    # Reads the daily rollups, so both ends of the range cover whole days
+    pipeline = [
+        {"$match": {"day": {"$gte": rollup_day(start_date), "$lte": rollup_day(end_date)}}},
+        {
+            "$group": {
+                "_id": {"vendor_id": "$vendor_id", "status": "$status"},
+                "total_orders": {"$sum": "$count"},
+                "total_amount": {"$sum": "$amount"},
+            }
+        },
+        {"$match": {"total_orders": {"$gt": 0}}},
+    ]
+
+    cursor = await order_rollups_analytics_collection.aggregate(pipeline)
+    async for row in cursor:
+        yield {
+            "vendor_id": str(row["_id"]["vendor_id"]),
+            "status": row["_id"]["status"],
+            "total_orders": row["total_orders"],
+            "total_amount": row["total_amount"],
+        }
+
+
+async def stream_summary(start_date: datetime, end_date: datetime):
+    """Yield summary rows from `summary_cache`, or off the aggregation cursor while filling it."""
+    key = (rollup_day(start_date), rollup_day(end_date))
+    cached = summary_cache.get(key)
+    if cached is not None:
+        for row in cached:
+            yield row
+        return
+
+    version = summary_cache.data_version
+    rows = []
+    async for row in iter_summary_rows(start_date, end_date):
+        rows.append(row)
+        yield row
+    summary_cache.set(key, rows, version)
+
+
+async def get_summary(start_date: datetime, end_date: datetime):
+    return [row async for row in stream_summary(start_date, end_date)]
+
+
+async def encode_csv(header: list[str], rows):
+    """Encode rows as CSV, yielding roughly `CSV_CHUNK_SIZE` bytes at a time."""
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    async for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CSV_CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def summary_csv_rows(start_date: datetime, end_date: datetime):
+    async for row in stream_summary(start_date, end_date):
+        yield [
+            row["vendor_id"],
+            row["status"],
+            row["total_orders"],
+            f"{row['total_amount']:.2f}",
+        ]
+
+
+def order_range_query(start_date: datetime, end_date: datetime) -> dict:
+    # Same whole-day range as the summary
+    return {
+        "order_date": {
+            "$gte": rollup_day(start_date),
+            "$lt": rollup_day(end_date) + timedelta(days=1),
+        }
+    }
+
+
+async def order_csv_rows(start_date: datetime, end_date: datetime):
+    query = order_range_query(start_date, end_date)
+    projection = {field: 1 for field in ORDERS_CSV_HEADER if field != "id"}
+    cursor = orders_analytics_collection.find(query, projection).sort("order_date", 1).batch_size(1000)
+    try:
+        async for order in cursor:
+            due_at = order.get("due_at")
+            yield [
+                str(order["_id"]),
+                order["order_date"].isoformat(),
+                order.get("user_id", ""),
+                str(order.get("vendor_id", "")),
+                order.get("status", ""),
+                f"{order.get('total_amount', 0):.2f}",
+                due_at.isoformat() if isinstance(due_at, datetime) else "",
+            ]
+    finally:
+        await cursor.close()
+
+
+def summary_csv(start_date: datetime, end_date: datetime):
+    return encode_csv(SUMMARY_CSV_HEADER, summary_csv_rows(start_date, end_date))
+
+
+def orders_csv(start_date: datetime, end_date: datetime):
+    return encode_csv(ORDERS_CSV_HEADER, order_csv_rows(start_date, end_date))
@@ -0,0 +1,39 @@
+from datetime import UTC, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+def bson_datetime(value):
+    """`value` as MongoDB hands it back: naive UTC, millisecond precision.
+
+    Responses built from an in-memory document instead of a read-back use
+    this, so they show the same timestamp a later GET does.
+    """
+    if not isinstance(value, datetime):
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def dump_json(content: Any) -> bytes:
+    """Encode API content with pydantic-core's Rust JSON encoder.
+
+    Datetimes and pydantic models are handled natively; any other unknown
+    type (e.g. ObjectId) falls back to `str`.
+    """
+    return to_json(content, fallback=str)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by `dump_json` instead of the stdlib `json` module.
+
+    Returning one directly from a handler also skips FastAPI's second
+    validation pass against `response_model`, which list endpoints do for
+    payloads their serializers already shaped.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
@@ -0,0 +1,31 @@
+from typing import Any, AsyncIterable, Callable
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.serialization import dump_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_stream(request: Request, stream: bool) -> bool:
+    """A list endpoint streams when asked via `?stream=1` or `Accept: application/x-ndjson`."""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(
+    rows: AsyncIterable[Any], serializer: Callable[[Any], Any]
+) -> StreamingResponse:
+    """Stream one JSON document per line as the cursor yields them."""
+
+    async def encode():
+        try:
+            async for row in rows:
+                yield dump_json(serializer(row)) + b"\n"
+        finally:
+            # Release the server-side cursor if the client goes away early
+            close = getattr(rows, "close", None) or getattr(rows, "aclose", None)
+            if close is not None:
+                await close()
+
+    return StreamingResponse(encode(), media_type=NDJSON_MEDIA_TYPE)
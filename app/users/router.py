@@ -1,11 +1,15 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from typing import Annotated
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from app.auth.service import get_current_active_user, get_password_hash
-from app.users.models import User, UserCreate, UserDB, UserUpdate
-from app.users.service import get_user, store_user
-from app.database import users_collection
+from app.users.models import User, UserCreate, UserUpdate
+from app.users.service import user_cache
+from app.database import users_analytics_collection, users_collection
+from app.indexes import ensured_collections
+from app.serialization import FastJSONResponse
 
 router = APIRouter(
     prefix="/users",
@@ -14,14 +18,14 @@ router = APIRouter(
 
 
 # ---------- Helpers ----------
-def user_to_model(user_doc: dict) -> User:
-    """Convert MongoDB document to User Pydantic model."""
-    return User(
-        id=str(user_doc["_id"]),
-        username=user_doc["username"],
-        role=user_doc.get("role", "customer"),
-        disabled=user_doc.get("disabled", False),
-    )
+def serialize_user(user_doc: dict) -> dict:
+    """Convert MongoDB document to the User response shape."""
+    return {
+        "id": str(user_doc["_id"]),
+        "username": user_doc["username"],
+        "disabled": user_doc.get("disabled", False),
+        "role": user_doc.get("role", "customer"),
+    }
 
 
 def validate_object_id(id: str) -> ObjectId:
@@ -33,27 +37,29 @@ def validate_object_id(id: str) -> ObjectId:
 # ---------- Routes ----------
 @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
 async def create_user(user: UserCreate):
-    existing_user = await get_user(username=user.username)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered",
-        )
-
-    hashed_password = get_password_hash(user.password)
+    # Normally the unique index on username rejects duplicates. If it could
+    # not be created (e.g. existing duplicate usernames), look first instead.
+    if users_collection.name not in ensured_collections:
+        if await users_collection.find_one({"username": user.username}, {"_id": 1}):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already registered",
+            )
+
+    hashed_password = await get_password_hash(user.password)
     user_dict = user.model_dump()
     user_dict["hashed_password"] = hashed_password
     user_dict["role"] = user_dict.get("role", "customer")
     user_dict.pop("password", None)
 
-    result = await users_collection.insert_one(user_dict)
-    created_user = await users_collection.find_one({"_id": result.inserted_id})
-    if not created_user:
+    try:
+        await users_collection.insert_one(user_dict)
+    except DuplicateKeyError:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create user",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered",
         )
-    return user_to_model(created_user)
+    return serialize_user(user_dict)
 
 
 @router.get("/", response_model=list[User])
@@ -64,7 +70,7 @@ async def list_users(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
     users = await users_collection.find({}).to_list(length=None)
-    return [user_to_model(user) for user in users]
+    return FastJSONResponse([serialize_user(user) for user in users])
 
 
 @router.get("/me", response_model=User)
@@ -75,7 +81,7 @@ async def read_users_me(
     user_doc = await users_collection.find_one({"username": current_user.username})
     if not user_doc:
         raise HTTPException(status_code=404, detail="User not found")
-    return user_to_model(user_doc)
+    return serialize_user(user_doc)
 
 
 @router.put("/{user_id}", response_model=User)
@@ -88,16 +94,19 @@ async def update_user(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
     oid = validate_object_id(user_id)
-    existing = await users_collection.find_one({"_id": oid})
-    if not existing:
-        raise HTTPException(status_code=404, detail="User not found")
-
     update_dict = {k: v for k, v in user_update.model_dump(exclude_none=True).items()}
     if update_dict:
-        await users_collection.update_one({"_id": oid}, {"$set": update_dict})
+        updated_user = await users_collection.find_one_and_update(
+            {"_id": oid}, {"$set": update_dict}, return_document=ReturnDocument.AFTER
+        )
+    else:
+        updated_user = await users_collection.find_one({"_id": oid})
+    if not updated_user:
+        raise HTTPException(status_code=404, detail="User not found")
 
-    updated_user = await users_collection.find_one({"_id": oid})
-    return user_to_model(updated_user)
+    # Drop the cached copy so role/disabled changes apply on the next request
+    user_cache.invalidate(updated_user["username"])
+    return serialize_user(updated_user)
 
 
 @router.get("/exists")
@@ -110,5 +119,5 @@ async def check_user_exists(email: str):
 
 @router.get("/count")
 async def get_users_count():
-    count = await users_collection.count_documents({})
+    count = await users_analytics_collection.count_documents({})
     return {"count": count}
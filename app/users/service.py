@@ -1,6 +1,16 @@
+from decouple import config
+
+from app.cache import TTLCache
 from app.database import users_collection
 from app.users.models import User, UserDB
 
+USER_CACHE_TTL_SECONDS = config("USER_CACHE_TTL_SECONDS", default=30, cast=float)
+USER_CACHE_MAX_SIZE = config("USER_CACHE_MAX_SIZE", default=1024, cast=int)
+
+
+# Authenticated users by username, so each request doesn't re-read its user
+user_cache = TTLCache(max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
 
 async def get_user(username: str):
     user = await users_collection.find_one({"username": username})
@@ -13,6 +23,16 @@ async def get_user(username: str):
     return None
 
 
+async def get_cached_user(username: str):
+    """Like `get_user`, but served from `user_cache` when a fresh entry exists."""
+    user = user_cache.get(username)
+    if user is None:
+        user = await get_user(username)
+        if user is not None:
+            user_cache.set(username, user)
+    return user
+
+
 async def store_user(user: UserDB) -> User | None:
     user_created = await users_collection.insert_one(user.model_dump())
     if user_created.acknowledged:
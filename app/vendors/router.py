@@ -1,41 +1,63 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from bson import ObjectId
+from pymongo import ReturnDocument
 from datetime import datetime, timezone
 
 from app.database import vendors_collection
+from app.fields import mongo_projection, parse_fields
+from app.serialization import FastJSONResponse, bson_datetime
+from app.streaming import ndjson_response, wants_stream
 from app.vendors.models import Vendor
+from app.vendors.service import vendor_registry
 
 router = APIRouter(prefix="/vendors", tags=["Vendors"])
 
 
 # ---------- Helper ----------
-def vendor_serializer(vendor) -> dict:
-    return {
-        "id": str(vendor["_id"]),
-        "name": vendor["name"],
-        "email": vendor["email"],
-        "phone": vendor["phone"],
-        "address": vendor["address"],
-        "created_at": str(vendor.get("created_at")),
-    }
+# How each response field is read off a vendors document
+VENDOR_FIELDS = {
+    "id": lambda vendor: str(vendor["_id"]),
+    "name": lambda vendor: vendor["name"],
+    "email": lambda vendor: vendor["email"],
+    "phone": lambda vendor: vendor["phone"],
+    "address": lambda vendor: vendor["address"],
+    "created_at": lambda vendor: str(vendor.get("created_at")),
+}
+
+
+def vendor_serializer(vendor, fields: list[str] | None = None) -> dict:
+    return {name: VENDOR_FIELDS[name](vendor) for name in fields or VENDOR_FIELDS}
 
 
 # ---------- CRUD Routes ----------
 @router.post("/", response_model=dict)
 async def create_vendor(vendor: Vendor):
     vendor_dict = vendor.model_dump()
-    vendor_dict["created_at"] = datetime.now(timezone.utc)
-    result = await vendors_collection.insert_one(vendor_dict)
-    new_vendor = await vendors_collection.find_one({"_id": result.inserted_id})
-    return vendor_serializer(new_vendor)
+    vendor_dict["created_at"] = bson_datetime(datetime.now(timezone.utc))
+    # insert_one fills in vendor_dict["_id"], so there is nothing to read back
+    await vendors_collection.insert_one(vendor_dict)
+    vendor_registry.put(vendor_dict)
+    return vendor_serializer(vendor_dict)
 
 
 @router.get("/", response_model=list[dict])
-async def get_vendors():
+async def get_vendors(
+    request: Request,
+    stream: bool = Query(False, description="Stream every vendor as NDJSON"),
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,name"),
+):
+    field_list = parse_fields(fields, VENDOR_FIELDS)
+    projection = mongo_projection(field_list) if field_list else None
+    if wants_stream(request, stream):
+        return ndjson_response(
+            vendors_collection.find({}, projection),
+            lambda vendor: vendor_serializer(vendor, field_list),
+        )
+
     vendors = []
-    async for vendor in vendors_collection.find():
-        vendors.append(vendor_serializer(vendor))
-    return vendors
+    async for vendor in vendors_collection.find({}, projection):
+        vendors.append(vendor_serializer(vendor, field_list))
+    return FastJSONResponse(vendors)
 
 
 @router.get("/{vendor_id}", response_model=dict)
@@ -53,12 +75,14 @@ async def update_vendor(vendor_id: str, updated: Vendor):
     if not ObjectId.is_valid(vendor_id):
         raise HTTPException(status_code=400, detail="Invalid ID format")
     update_data = {k: v for k, v in updated.model_dump().items() if v is not None}
-    result = await vendors_collection.update_one(
-        {"_id": ObjectId(vendor_id)}, {"$set": update_data}
+    updated_vendor = await vendors_collection.find_one_and_update(
+        {"_id": ObjectId(vendor_id)},
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER,
     )
-    if result.matched_count == 0:
+    if not updated_vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
-    updated_vendor = await vendors_collection.find_one({"_id": ObjectId(vendor_id)})
+    vendor_registry.put(updated_vendor)
     return vendor_serializer(updated_vendor)
 
 
@@ -67,6 +91,7 @@ async def delete_vendor(vendor_id: str):
     if not ObjectId.is_valid(vendor_id):
         raise HTTPException(status_code=400, detail="Invalid ID format")
     result = await vendors_collection.delete_one({"_id": ObjectId(vendor_id)})
+    vendor_registry.remove(ObjectId(vendor_id))
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Vendor not found")
     return {"message": "Vendor deleted successfully"}
@@ -0,0 +1,55 @@
+from bson import ObjectId
+from decouple import config
+
+from app.cache import PeriodicSnapshot
+from app.database import vendors_collection
+
+VENDOR_REGISTRY_TTL_SECONDS = config("VENDOR_REGISTRY_TTL_SECONDS", default=300, cast=float)
+
+
+class VendorRegistry(PeriodicSnapshot):
+    """In-process copy of the vendors collection, reloaded every `ttl` seconds.
+
+    Vendors are few and rarely change, so order validation can check the
+    registry instead of querying Mongo on every write.
+    """
+
+    def __init__(self, ttl: float):
+        super().__init__(ttl)
+        self._vendors: dict[ObjectId, dict] = {}
+
+    async def _fetch(self):
+        vendors = {}
+        async for vendor in vendors_collection.find():
+            vendors[vendor["_id"]] = vendor
+        self._vendors = vendors
+
+    async def exists(self, vendor_id: ObjectId) -> bool:
+        await self.refresh_if_stale()
+        if vendor_id in self._vendors:
+            return True
+        # The vendor may have been created by another worker since the last load
+        vendor = await vendors_collection.find_one({"_id": vendor_id})
+        if vendor:
+            self.put(vendor)
+            return True
+        return False
+
+    async def missing(self, vendor_ids: set[ObjectId]) -> set[ObjectId]:
+        """Return the ids that name no vendor, querying Mongo once for any not cached."""
+        await self.refresh_if_stale()
+        unknown = {vendor_id for vendor_id in vendor_ids if vendor_id not in self._vendors}
+        if unknown:
+            async for vendor in vendors_collection.find({"_id": {"$in": list(unknown)}}):
+                self.put(vendor)
+                unknown.discard(vendor["_id"])
+        return unknown
+
+    def put(self, vendor: dict):
+        self._vendors[vendor["_id"]] = vendor
+
+    def remove(self, vendor_id: ObjectId):
+        self._vendors.pop(vendor_id, None)
+
+
+vendor_registry = VendorRegistry(VENDOR_REGISTRY_TTL_SECONDS)
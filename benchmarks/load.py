@@ -0,0 +1,335 @@
+"""Load test for every router against a seeded local MongoDB.
+
+Seeds a dedicated database (dropped and recreated on every run) with users,
+vendors, products and orders, runs the app's lifespan in-process and drives
+it with concurrent clients through `httpx.ASGITransport`, so no server or
+network hop is involved. Reports throughput and p50/p95/p99 latency per
+endpoint and writes them to JSON; pass an earlier file to --compare to see
+what moved.
+
+    python -m benchmarks.load --orders 20000 --requests 500 --concurrency 16
+    python -m benchmarks.load --compare benchmarks/results/load-20261018-101500.json
+
+MONGODB_URL (from .env or the environment) must point at a MongoDB you can
+write to; only the --db-name database is touched.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import httpx
+from bson import ObjectId
+from decouple import config
+
+DEFAULT_DB_NAME = "optiflow_bench"
+RESULTS_DIR = Path(__file__).parent / "results"
+SEED_BATCH_SIZE = 1000
+PASSWORD = "bench-password"
+STATUSES = ["pending", "in_progress", "completed", "cancelled"]
+CATEGORIES = ["electronics", "jewelery", "men's clothing", "women's clothing"]
+
+
+# ---------- Seeding ----------
+def fake_users(count: int, hashed_password: str) -> list[dict]:
+    users = [{"username": "bench-admin", "hashed_password": hashed_password, "role": "admin", "disabled": False}]
+    users += [
+        {"username": f"bench-user-{i}", "hashed_password": hashed_password, "role": "customer", "disabled": False}
+        for i in range(count)
+    ]
+    return users
+
+
+def fake_vendors(count: int) -> list[dict]:
+    now = datetime.now(UTC)
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Vendor {i}",
+            "email": f"vendor{i}@example.com",
+            "phone": f"555-01{i:04d}",
+            "address": f"{i} Market Street",
+            "created_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def fake_products(count: int, rng: random.Random) -> list[dict]:
+    now = datetime.now(UTC)
+    return [
+        {
+            "id": i + 1,
+            "title": f"Product {i + 1}",
+            "price": round(rng.uniform(1, 500), 2),
+            "description": f"Benchmark product number {i + 1}",
+            "category": rng.choice(CATEGORIES),
+            "image": f"https://example.com/products/{i + 1}.jpg",
+            "rating": {"rate": round(rng.uniform(1, 5), 1), "count": rng.randint(0, 500)},
+            "created_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def fake_order(rng: random.Random, vendor_ids: list, usernames: list[str], days: int) -> dict:
+    order_date = datetime.now(UTC) - timedelta(minutes=rng.randint(0, days * 24 * 60))
+    items = [
+        {"product_name": f"Product {rng.randint(1, 1000)}", "quantity": rng.randint(1, 5), "price": round(rng.uniform(1, 100), 2)}
+        for _ in range(rng.randint(1, 4))
+    ]
+    return {
+        "vendor_id": rng.choice(vendor_ids),
+        "user_id": rng.choice(usernames),
+        "order_date": order_date,
+        "items": items,
+        "status": rng.choice(STATUSES),
+        "total_amount": sum(item["price"] * item["quantity"] for item in items),
+        "special_instructions": None,
+        "due_at": order_date + timedelta(days=rng.randint(1, 14)),
+    }
+
+
+async def seed(args, rng: random.Random) -> dict:
+    from app.auth.service import get_password_hash
+    from app.database import (
+        orders_collection,
+        products_collection,
+        users_collection,
+        vendors_collection,
+    )
+    from app.products.service import product_catalog
+    from app.reporting.rollups import rebuild_rollups
+    from app.vendors.service import vendor_registry
+
+    # One hash shared by every user keeps seeding fast
+    users = fake_users(args.users, await get_password_hash(PASSWORD))
+    await users_collection.insert_many(users)
+    vendors = fake_vendors(args.vendors)
+    await vendors_collection.insert_many(vendors)
+    await products_collection.insert_many(fake_products(args.products, rng))
+
+    vendor_ids = [vendor["_id"] for vendor in vendors]
+    usernames = [user["username"] for user in users[1:]]
+    for offset in range(0, args.orders, SEED_BATCH_SIZE):
+        batch = min(SEED_BATCH_SIZE, args.orders - offset)
+        await orders_collection.insert_many(
+            [fake_order(rng, vendor_ids, usernames, args.days) for _ in range(batch)],
+            ordered=False,
+        )
+
+    # The lifespan warmed these up against empty collections
+    await rebuild_rollups()
+    await vendor_registry.load()
+    await product_catalog.load()
+
+    own_orders = await orders_collection.find({"user_id": usernames[0]}, {"_id": 1}).to_list(length=1000)
+    return {
+        "username": usernames[0],
+        "vendor_ids": [str(vendor_id) for vendor_id in vendor_ids],
+        "order_ids": [str(order["_id"]) for order in own_orders],
+    }
+
+
+# ---------- Scenarios ----------
+def date_window(rng: random.Random, days: int, width: int) -> dict:
+    start = datetime.now(UTC).date() - timedelta(days=rng.randint(width, max(days, width)))
+    return {"start": start.isoformat(), "end": (start + timedelta(days=width)).isoformat()}
+
+
+def scenarios(args, seeded: dict) -> dict:
+    """Endpoint label -> function building the request kwargs from an RNG."""
+    vendor_ids, order_ids = seeded["vendor_ids"], seeded["order_ids"] or [str(ObjectId())]
+
+    def new_order(rng):
+        return {
+            "method": "POST",
+            "url": "/orders/",
+            "json": {
+                "vendor_id": rng.choice(vendor_ids),
+                "items": [{"product_name": "Bench item", "quantity": rng.randint(1, 5), "price": 9.99}],
+                "status": "pending",
+            },
+        }
+
+    return {
+        "POST /auth/token": lambda rng: {
+            "method": "POST",
+            "url": "/auth/token",
+            "data": {"username": seeded["username"], "password": PASSWORD},
+        },
+        "GET /users/me": lambda rng: {"method": "GET", "url": "/users/me"},
+        "GET /users/count": lambda rng: {"method": "GET", "url": "/users/count"},
+        "GET /orders/": lambda rng: {"method": "GET", "url": "/orders/", "params": {"limit": 50}},
+        "GET /orders/{order_id}": lambda rng: {"method": "GET", "url": f"/orders/{rng.choice(order_ids)}"},
+        "POST /orders/": new_order,
+        "GET /calendar/": lambda rng: {"method": "GET", "url": "/calendar/", "params": date_window(rng, args.days, 7)},
+        "GET /reports/summary": lambda rng: {
+            "method": "GET",
+            "url": "/reports/summary",
+            "params": date_window(rng, args.days, 30),
+        },
+        "GET /vendors/": lambda rng: {"method": "GET", "url": "/vendors/"},
+        "GET /vendors/{vendor_id}": lambda rng: {"method": "GET", "url": f"/vendors/{rng.choice(vendor_ids)}"},
+        "GET /products/": lambda rng: {"method": "GET", "url": "/products/"},
+        "GET /products/?category&sort": lambda rng: {
+            "method": "GET",
+            "url": "/products/",
+            "params": {"category": rng.choice(CATEGORIES), "sort": "price", "limit": 20},
+        },
+        "GET /products/{product_id}": lambda rng: {
+            "method": "GET",
+            "url": f"/products/{rng.randint(1, max(args.products, 1))}",
+        },
+    }
+
+
+# ---------- Runner ----------
+async def run_scenario(client: httpx.AsyncClient, build, args, rng: random.Random) -> dict:
+    latencies, errors = [], 0
+    remaining = args.requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            request = build(rng)
+            started = time.perf_counter()
+            response = await client.request(**request)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    for _ in range(args.warmup):
+        await client.request(**build(rng))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(percentiles[49], 3),
+        "p95_ms": round(percentiles[94], 3),
+        "p99_ms": round(percentiles[98], 3),
+    }
+
+
+async def run(args) -> dict:
+    from app.database import mongo_connection
+    import app.database as database
+    from app.main import app
+
+    async with mongo_connection():
+        await database.client.drop_database(args.db_name)
+
+    rng = random.Random(args.seed)
+    async with app.router.lifespan_context(app):
+        print(f"Seeding {args.db_name}: {args.users} users, {args.vendors} vendors, "
+              f"{args.products} products, {args.orders} orders...")
+        seeded = await seed(args, rng)
+        print_header()
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            token = await client.post("/auth/token", data={"username": seeded["username"], "password": PASSWORD})
+            token.raise_for_status()
+            client.headers["Authorization"] = f"Bearer {token.json()['access_token']}"
+
+            results = {}
+            selected = scenarios(args, seeded)
+            for label, build in selected.items():
+                if args.only and not any(part in label for part in args.only):
+                    continue
+                results[label] = await run_scenario(client, build, args, rng)
+                print_row(label, results[label])
+
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": sys.version.split()[0],
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "endpoints": results,
+    }
+
+
+# ---------- Reporting ----------
+def print_header():
+    print(f"{'endpoint':34} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+
+
+def print_row(label: str, row: dict):
+    print(
+        f"{label:34} {row['throughput_rps']:9.1f} {row['p50_ms']:9.2f} "
+        f"{row['p95_ms']:9.2f} {row['p99_ms']:9.2f} {row['errors']:7d}"
+    )
+
+
+def print_comparison(previous: dict, current: dict):
+    print(f"\nChange vs {previous['timestamp']} (negative latency is better)")
+    print(f"{'endpoint':34} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for label, row in current["endpoints"].items():
+        before = previous["endpoints"].get(label)
+        if not before:
+            continue
+        changes = [
+            (row[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+        ]
+        print(f"{label:34} " + " ".join(f"{change:+8.1f}%" for change in changes))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load-test every router against a seeded MongoDB.")
+    parser.add_argument("--db-name", default=DEFAULT_DB_NAME, help="Scratch database, dropped on every run")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--vendors", type=int, default=100)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--days", type=int, default=180, help="Spread order dates over this many days")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed requests per endpoint")
+    parser.add_argument("--seed", type=int, default=5035)
+    parser.add_argument("--only", nargs="*", help="Only endpoints whose label contains one of these")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/load-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args()
+    # Read before main() points MONGODB_DB_NAME at the scratch database
+    app_db_name = config("MONGODB_DB_NAME", default="optiflow")
+    if args.db_name == app_db_name:
+        parser.error(f"refusing to drop the application database {app_db_name!r}; pick another --db-name")
+    if args.requests < 2:
+        parser.error("--requests must be at least 2 to compute percentiles")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+
+def main():
+    args = parse_args()
+    # Must be set before app.database is imported so every handle uses it
+    os.environ["MONGODB_DB_NAME"] = args.db_name
+
+    results = asyncio.run(run(args))
+
+    output = args.output or RESULTS_DIR / f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        print_comparison(json.loads(args.compare.read_text()), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Per-document cost of encoding GET /orders/ pages.
+
+"before" mirrors what FastAPI does for a handler returning plain dicts with a
+`response_model`: validate every item, dump it back to JSON-compatible Python,
+then encode with the stdlib `json` module. "after" is the path the list
+endpoints use now: the serializer output goes straight to `dump_json`.
+
+    python -m benchmarks.serialization --orders 1000 --repeat 20
+"""
+import argparse
+import json
+import timeit
+from datetime import UTC, datetime, timedelta
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from app.orders.models import OrderPage
+from app.orders.service import serialize_order
+from app.serialization import dump_json
+
+
+def fake_orders(count: int) -> list[dict]:
+    now = datetime.now(UTC).replace(tzinfo=None)
+    return [
+        {
+            "_id": ObjectId(),
+            "vendor_id": ObjectId(),
+            "user_id": f"user{i % 50}",
+            "order_date": now - timedelta(minutes=i),
+            "items": [
+                {"product_name": f"product {j}", "quantity": j + 1, "price": 9.99}
+                for j in range(3)
+            ],
+            "status": "pending",
+            "total_amount": 59.94,
+            "special_instructions": "Leave at the back door",
+            "due_at": now + timedelta(days=i % 30),
+        }
+        for i in range(count)
+    ]
+
+
+page_adapter = TypeAdapter(OrderPage)
+
+
+def before(docs: list[dict]) -> bytes:
+    page = {"items": [serialize_order(doc) for doc in docs], "next": None}
+    validated = page_adapter.validate_python(page)
+    content = page_adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def after(docs: list[dict]) -> bytes:
+    return dump_json({"items": [serialize_order(doc) for doc in docs], "next": None})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    docs = fake_orders(args.orders)
+    for name, fn in (("before", before), ("after", after)):
+        best = min(timeit.repeat(lambda: fn(docs), number=1, repeat=args.repeat))
+        print(f"{name:>6}: {best / args.orders * 1e6:8.2f} us/order ({best * 1e3:.1f} ms/page)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Cold-start cost of a worker: time to import `app.main` and the RSS it leaves.
+
+Each run is a fresh interpreter started with `-X importtime`, the same data
+`python -X importtime -c "import app.main"` prints. The slowest imports are
+listed so regressions are easy to attribute, and the script exits non-zero
+when the median run is over budget or an endpoint-only dependency (see
+LAZY_MODULES) was loaded at startup.
+
+    python -m benchmarks.startup --runs 5 --max-import-ms 1500 --max-rss-mb 150
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+# Only needed by a few endpoints, so they must not be imported with the app
+LAZY_MODULES = ["reportlab", "multiprocessing", "concurrent.futures.process"]
+
+PROBE = f"""
+import resource, sys
+import app.main
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+loaded = [name for name in {LAZY_MODULES!r} if name in sys.modules]
+print("RESULT", rss_kb, ",".join(loaded))
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def run_once() -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, module = match.groups()
+            imports[module] = (int(self_us), int(cumulative_us))
+    _, rss_kb, loaded = proc.stdout.split("RESULT", 1)[1].split(" ", 2)
+    return {
+        "import_ms": imports["app.main"][1] / 1000,
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        "rss_mb": int(rss_kb) / (1024 * 1024 if sys.platform == "darwin" else 1024),
+        "eager": [name for name in loaded.strip().split(",") if name],
+        "imports": imports,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest top-level packages to list")
+    parser.add_argument("--max-import-ms", type=float, default=1500)
+    parser.add_argument("--max-rss-mb", type=float, default=150)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    rss_mb = statistics.median(run["rss_mb"] for run in runs)
+
+    # Group by top-level package, from the last (warmest) run
+    packages = {}
+    for module, (self_us, _) in runs[-1]["imports"].items():
+        root = module.split(".")[0]
+        packages[root] = packages.get(root, 0) + self_us
+    print(f"{'package':30} {'self ms':>9}")
+    for root, self_us in sorted(packages.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{root:30} {self_us / 1000:9.1f}")
+
+    print(f"\nimport app.main: {import_ms:.1f} ms (median of {args.runs}, budget {args.max_import_ms:g})")
+    print(f"baseline RSS:    {rss_mb:.1f} MiB (median of {args.runs}, budget {args.max_rss_mb:g})")
+
+    failures = []
+    if import_ms > args.max_import_ms:
+        failures.append(f"import time {import_ms:.1f} ms is over budget")
+    if rss_mb > args.max_rss_mb:
+        failures.append(f"RSS {rss_mb:.1f} MiB is over budget")
+    eager = sorted({name for run in runs for name in run["eager"]})
+    if eager:
+        failures.append(f"loaded at startup but should be lazy: {', '.join(eager)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
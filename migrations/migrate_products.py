@@ -1,15 +1,25 @@
+import argparse
 import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+
 from httpx import AsyncClient
 from pymongo import UpdateOne
 from decouple import config
 
-from app.database import products_collection
+from app.database import mongo_connection, products_collection
 
-FAKESTORE_URL = config("FAKESTORE_URL")
+FAKESTORE_URL = config("FAKESTORE_URL", default="")
+DEFAULT_CHECKPOINT = ".migrate_products.checkpoint.json"
 
-async def fetch_products():
+async def fetch_products(source: str):
+    # A local JSON file (e.g. a saved catalog) stands in for the upstream API
+    if not source.startswith(("http://", "https://")):
+        return json.loads(Path(source).read_text())
     async with AsyncClient(timeout=30) as client:
-        resp = await client.get(FAKESTORE_URL)
+        resp = await client.get(source)
         resp.raise_for_status()
         return resp.json()
 
@@ -25,39 +35,120 @@ def transform_product(item: dict) -> dict:
         "source": "fakestoreapi"
     }
 
+def content_hash(doc: dict) -> str:
+    return hashlib.sha256(json.dumps(doc, sort_keys=True).encode()).hexdigest()
+
+def load_checkpoint(path: Path, source_digest: str) -> set[int]:
+    """Product ids already written by an interrupted run over the same source data."""
+    if not path.exists():
+        return set()
+    checkpoint = json.loads(path.read_text())
+    if checkpoint.get("source_digest") != source_digest:
+        return set()
+    return set(checkpoint.get("done", []))
+
+def save_checkpoint(path: Path, source_digest: str, done: set[int]):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"source_digest": source_digest, "done": sorted(done)}))
+    os.replace(tmp, path)
+
 async def create_indexes():
     await products_collection.create_index("id", unique=True)
     await products_collection.create_index("category")
 
-async def migrate():
-    print("Fetching products from fakestoreapi...")
-    items = await fetch_products()
+async def existing_hashes() -> dict[int, str]:
+    hashes = {}
+    async for doc in products_collection.find({}, {"_id": 0, "id": 1, "content_hash": 1}):
+        hashes[doc["id"]] = doc.get("content_hash")
+    return hashes
+
+async def migrate(
+    source: str = FAKESTORE_URL,
+    chunk_size: int = 500,
+    concurrency: int = 4,
+    checkpoint_path: str = DEFAULT_CHECKPOINT,
+    full: bool = False,
+):
+    print(f"Fetching products from {source}...")
+    items = await fetch_products(source)
     if not isinstance(items, list):
         print("Unexpected response format:", items)
         return
 
     print(f"Fetched {len(items)} products. Transforming...")
-    ops = []
+    docs = []
     for item in items:
         doc = transform_product(item)
-        ops.append(
-            UpdateOne(
-                {"id": doc["id"]},
-                {"$set": doc},
-                upsert=True
-            )
-        )
+        doc["content_hash"] = content_hash(doc)
+        docs.append(doc)
+    docs.sort(key=lambda doc: doc["id"])
 
-    if not ops:
-        print("No operations to run.")
-        return
+    checkpoint = Path(checkpoint_path)
+    source_digest = content_hash({"docs": [doc["content_hash"] for doc in docs]})
+    done = load_checkpoint(checkpoint, source_digest)
+    if done:
+        print(f"Resuming: {len(done)} products already written by a previous run.")
 
     print("Creating indexes (if not exist)...")
     await create_indexes()
 
-    print("Running bulk_write (upsert)...")
-    result = await products_collection.bulk_write(ops, ordered=False)
-    print("Bulk write result:", result.bulk_api_result)
+    # Incremental mode only rewrites products whose content changed upstream
+    current = {} if full else await existing_hashes()
+    pending = [
+        doc for doc in docs
+        if doc["id"] not in done and current.get(doc["id"]) != doc["content_hash"]
+    ]
+    print(f"{len(docs) - len(pending)} unchanged or already written, {len(pending)} to write.")
+    if not pending:
+        checkpoint.unlink(missing_ok=True)
+        print("No operations to run.")
+        return
+
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    slots = asyncio.Semaphore(concurrency)
+
+    async def write_chunk(number: int, chunk: list[dict]):
+        ops = [UpdateOne({"id": doc["id"]}, {"$set": doc}, upsert=True) for doc in chunk]
+        async with slots:
+            result = await products_collection.bulk_write(ops, ordered=False)
+        done.update(doc["id"] for doc in chunk)
+        save_checkpoint(checkpoint, source_digest, done)
+        print(
+            f"Chunk {number + 1}/{len(chunks)}: "
+            f"{result.upserted_count} inserted, {result.modified_count} updated"
+        )
+
+    print(f"Running bulk_write (upsert) in {len(chunks)} chunk(s), {concurrency} at a time...")
+    await asyncio.gather(*(write_chunk(number, chunk) for number, chunk in enumerate(chunks)))
+
+    checkpoint.unlink(missing_ok=True)
+    print("Migration complete.")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sync the product catalog into MongoDB.")
+    parser.add_argument("--source", default=FAKESTORE_URL, help="Catalog URL or local JSON file")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--full", action="store_true", help="Rewrite every product, even unchanged ones")
+    args = parser.parse_args()
+    if not args.source:
+        parser.error("no catalog source: set FAKESTORE_URL or pass --source")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+async def main(args):
+    async with mongo_connection():
+        await migrate(
+            source=args.source,
+            chunk_size=args.chunk_size,
+            concurrency=args.concurrency,
+            checkpoint_path=args.checkpoint,
+            full=args.full,
+        )
 
 if __name__ == "__main__":
-    asyncio.run(migrate())
\ No newline at end of file
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,18 @@
+import asyncio
+
+from app.database import mongo_connection
+from app.indexes import ensure_indexes
+from app.reporting.rollups import rebuild_rollups
+
+
+async def rebuild():
+    async with mongo_connection():
+        print("Ensuring indexes (if not exist)...")
+        await ensure_indexes()
+
+        print("Rebuilding order_rollups from orders ($merge)...")
+        removed = await rebuild_rollups()
+        print(f"Rollups rebuilt. Removed {removed} stale rollup(s).")
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
@@ -0,0 +1,88 @@
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+
+# app.database and app.auth read these at import time; a real .env or
+# environment wins, these only make the modules importable in a bare checkout
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+REPLICA_SET_DB_NAME = "optiflow_test"
+
+COMPOSE_FILE = os.path.join(os.path.dirname(__file__), "docker-compose.yml")
+COMPOSE = ["docker", "compose", "-f", COMPOSE_FILE, "-p", "optiflow-test"]
+COMPOSE_MEMBERS = ["localhost:27117", "localhost:27118", "localhost:27119"]
+COMPOSE_READY_TIMEOUT_SECONDS = 90
+
+
+def docker_compose_available() -> bool:
+    if shutil.which("docker") is None:
+        return False
+    try:
+        subprocess.run([*COMPOSE, "version"], capture_output=True, check=True, timeout=30)
+        subprocess.run(["docker", "info"], capture_output=True, check=True, timeout=30)
+    except (subprocess.SubprocessError, OSError):
+        return False
+    return True
+
+
+def initiate_replica_set():
+    """Initiate the compose replica set and wait for a primary and two secondaries."""
+    from pymongo import MongoClient
+    from pymongo.errors import OperationFailure, PyMongoError
+
+    config = {
+        "_id": "rs0",
+        "members": [{"_id": index, "host": host} for index, host in enumerate(COMPOSE_MEMBERS)],
+    }
+    deadline = time.monotonic() + COMPOSE_READY_TIMEOUT_SECONDS
+    last_error = None
+    while time.monotonic() < deadline:
+        client = MongoClient(
+            f"mongodb://{COMPOSE_MEMBERS[0]}/?directConnection=true",
+            serverSelectionTimeoutMS=2000,
+        )
+        try:
+            try:
+                client.admin.command("replSetInitiate", config)
+            except OperationFailure as exc:
+                # AlreadyInitialized: a previous attempt got this far
+                if exc.code != 23:
+                    raise
+            states = [member["stateStr"] for member in client.admin.command("replSetGetStatus")["members"]]
+            if states.count("PRIMARY") == 1 and states.count("SECONDARY") == len(COMPOSE_MEMBERS) - 1:
+                return
+            last_error = f"member states {states}"
+        except PyMongoError as exc:
+            last_error = exc
+        finally:
+            client.close()
+        time.sleep(1)
+    raise RuntimeError(f"Replica set did not become ready: {last_error}")
+
+
+@pytest.fixture(scope="session")
+def replica_set_url():
+    """URL of a replica set with a primary and readable secondaries.
+
+    MONGODB_REPLICA_SET_URL is used when set. Otherwise tests/docker-compose.yml
+    is started and initiated for the session, and torn down afterwards; tests
+    using this fixture are skipped only when Docker is not available.
+    """
+    url = os.environ.get("MONGODB_REPLICA_SET_URL")
+    if url:
+        yield url
+        return
+    if not docker_compose_available():
+        pytest.skip("MONGODB_REPLICA_SET_URL is not set and Docker Compose is not available")
+
+    subprocess.run([*COMPOSE, "up", "-d"], check=True)
+    try:
+        initiate_replica_set()
+        yield f"mongodb://{','.join(COMPOSE_MEMBERS)}/?replicaSet=rs0"
+    finally:
+        subprocess.run([*COMPOSE, "down", "-v"], check=False)
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from app import database
+from app.database import (
+    ANALYTICS_MAX_STALENESS_SECONDS,
+    order_rollups_analytics_collection,
+    order_rollups_collection,
+    orders_analytics_collection,
+    orders_collection,
+    users_analytics_collection,
+    users_collection,
+)
+from tests.conftest import REPLICA_SET_DB_NAME
+
+ANALYTICS_HANDLES = [
+    orders_analytics_collection,
+    order_rollups_analytics_collection,
+    users_analytics_collection,
+]
+PRIMARY_HANDLES = [orders_collection, order_rollups_collection, users_collection]
+
+
+def read_preferences(handles):
+    """Resolve each handle against a client; no server is contacted."""
+
+    async def resolve():
+        async with database.mongo_connection():
+            return [handle.read_preference for handle in handles]
+
+    return asyncio.run(resolve())
+
+
+@pytest.mark.parametrize("handle", ANALYTICS_HANDLES, ids=lambda handle: handle.name)
+def test_analytics_handles_prefer_fresh_secondaries(handle):
+    (preference,) = read_preferences([handle])
+    assert preference.mongos_mode == "secondaryPreferred"
+    assert preference.max_staleness == ANALYTICS_MAX_STALENESS_SECONDS
+    assert preference.document["maxStalenessSeconds"] == ANALYTICS_MAX_STALENESS_SECONDS
+
+
+@pytest.mark.parametrize("handle", PRIMARY_HANDLES, ids=lambda handle: handle.name)
+def test_write_path_handles_stay_on_primary(handle):
+    (preference,) = read_preferences([handle])
+    assert preference.mongos_mode == "primary"
+
+
+def test_analytics_reads_are_served_by_a_secondary(replica_set_url, monkeypatch):
+    monkeypatch.setattr(database, "MONGODB_URL", replica_set_url)
+    monkeypatch.setattr(database, "MONGODB_DB_NAME", REPLICA_SET_DB_NAME)
+
+    async def read_addresses():
+        async with database.mongo_connection():
+            await database.client.aconnect()
+            secondaries = await database.client.secondaries
+            assert secondaries, "the replica set has no readable secondary"
+
+            analytics = orders_analytics_collection.find({}).limit(1)
+            await analytics.to_list(length=1)
+            primary = orders_collection.find({}).limit(1)
+            await primary.to_list(length=1)
+            return analytics.address, primary.address, secondaries, await database.client.primary
+
+    analytics_address, primary_address, secondaries, primary = asyncio.run(read_addresses())
+    assert analytics_address in secondaries
+    assert primary_address == primary